@@ -5,18 +5,59 @@ Maps specific intents to targeted ClickHouse queries with appropriate pattern_ty
 """
 
 import json
+import logging
+import re
+import time
 import requests
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Any, Iterator, Optional
+from datetime import date, datetime
+
+logger = logging.getLogger(__name__)
+
+# Native TCP protocol client (optional - HTTP is used when not installed)
+try:
+    from clickhouse_driver import Client as NativeClient
+    from clickhouse_driver.errors import NetworkError, ServerException
+except ImportError:
+    NativeClient = None
+    NetworkError = OSError
+
+    class ServerException(Exception):
+        """Placeholder so except clauses work without clickhouse-driver (never raised)"""
 
 
 # ClickHouse Configuration
-CLICKHOUSE_URL = "http://ec2-47-129-241-41.ap-southeast-1.compute.amazonaws.com:8123"
+CLICKHOUSE_HOST = "ec2-47-129-241-41.ap-southeast-1.compute.amazonaws.com"
+CLICKHOUSE_URL = f"http://{CLICKHOUSE_HOST}:8123"
+CLICKHOUSE_NATIVE_PORT = 9000
 CLICKHOUSE_USER = "wm_test"
 CLICKHOUSE_PASSWORD = "Watermelon@123"
 CLICKHOUSE_DB = "metrics"
 CLICKHOUSE_TABLE = "ai_service_behavior_memory"
 
+# Rows per block streamed back over the native protocol
+CLICKHOUSE_MAX_BLOCK_SIZE = 100000
+
+# After a failed native connect, every thread goes straight to HTTP for this long
+# instead of each waiting out connect_timeout again
+NATIVE_RETRY_SECONDS = 300
+_native_unavailable_until = 0.0
+
+# HTTP interface connection pool (fallback path); blocks instead of opening extra
+# connections when all are busy, so concurrent queries can't exhaust max_connections
+CLICKHOUSE_HTTP_POOL_SIZE = 16
+
+CLICKHOUSE_SESSION = requests.Session()
+CLICKHOUSE_SESSION.mount("http://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=CLICKHOUSE_HTTP_POOL_SIZE,
+    pool_block=True
+))
+
+# The native protocol returns typed rows, so the HTTP output format clause is dropped
+_FORMAT_CLAUSE_PATTERN = re.compile(r'\s+FORMAT\s+\w+\s*$', re.IGNORECASE)
+
 
 def ms_to_datetime_str(timestamp_ms: int) -> str:
     """Convert Unix timestamp in milliseconds to ClickHouse datetime string"""
@@ -24,18 +65,114 @@ def ms_to_datetime_str(timestamp_ms: int) -> str:
     return dt.strftime("%Y-%m-%d %H:%M:%S")
 
 
-def execute_clickhouse_query(query: str) -> List[Dict[str, Any]]:
+def create_native_client() -> Optional[Any]:
+    """
+    Create a native-protocol (TCP 9000) ClickHouse client
+
+    Returns:
+        clickhouse_driver Client, or None when clickhouse-driver is not installed
+    """
+    if NativeClient is None:
+        return None
+    return NativeClient(
+        host=CLICKHOUSE_HOST,
+        port=CLICKHOUSE_NATIVE_PORT,
+        user=CLICKHOUSE_USER,
+        password=CLICKHOUSE_PASSWORD,
+        database=CLICKHOUSE_DB,
+        connect_timeout=2  # Fail over to HTTP quickly when port 9000 is closed
+    )
+
+
+def iter_native_query(client: Any, query: str) -> Optional[Iterator[Dict[str, Any]]]:
+    """
+    Start a query over the native protocol and stream its rows block by block
+
+    The connection is established eagerly (so the caller can fall back to HTTP);
+    rows are decoded lazily as the returned iterator is consumed. Datetime values
+    are rendered as 'YYYY-MM-DD HH:MM:SS' strings so rows match the JSONEachRow
+    output of the HTTP interface.
+
+    Args:
+        client: Client from create_native_client()
+        query: SQL query string (a trailing FORMAT clause is ignored)
+
+    Returns:
+        Iterator of result rows as dictionaries, or None if the native port is unreachable
+        (now or within the last NATIVE_RETRY_SECONDS)
+
+    Raises:
+        ServerException: ClickHouse rejected the query (bad SQL, authentication)
+    """
+    global _native_unavailable_until
+    if time.monotonic() < _native_unavailable_until:
+        return None
+
+    try:
+        rows_iter = client.execute_iter(
+            _FORMAT_CLAUSE_PATTERN.sub('', query.strip()),
+            settings={'max_block_size': CLICKHOUSE_MAX_BLOCK_SIZE},
+            with_column_types=True
+        )
+        columns = [name for name, _ in next(rows_iter)]
+
+    except (NetworkError, OSError, EOFError) as e:
+        logger.warning("⚠ ClickHouse native port unreachable, using HTTP for %ss: %s", NATIVE_RETRY_SECONDS, e)
+        _native_unavailable_until = time.monotonic() + NATIVE_RETRY_SECONDS
+        return None
+
+    return (
+        {
+            column: value.strftime("%Y-%m-%d %H:%M:%S") if isinstance(value, datetime)
+            else value.isoformat() if isinstance(value, date)
+            else value
+            for column, value in zip(columns, values)
+        }
+        for values in rows_iter
+    )
+
+
+def execute_native_query(client: Any, query: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Execute a query over the native protocol
+
+    Args:
+        client: Client from create_native_client()
+        query: SQL query string (a trailing FORMAT clause is ignored)
+
+    Returns:
+        List of result rows as dictionaries, or None if the native port is unreachable
+
+    Raises:
+        ServerException: ClickHouse rejected the query (bad SQL, authentication)
+    """
+    rows_iter = iter_native_query(client, query)
+    return list(rows_iter) if rows_iter is not None else None
+
+
+def execute_clickhouse_query(query: str, client: Optional[Any] = None) -> List[Dict[str, Any]]:
     """
     Execute a ClickHouse query and return results
 
     Args:
         query: SQL query string
+        client: Optional native client; HTTP is used when None or unreachable
 
     Returns:
         List of result rows as dictionaries
     """
+    if client is not None:
+        try:
+            rows = execute_native_query(client, query)
+        except ServerException as e:
+            # Same handling as an HTTP error response
+            logger.error("✗ ClickHouse server error: %s", e)
+            return []
+        if rows is not None:
+            return rows
+
     try:
-        response = requests.get(
+        response = CLICKHOUSE_SESSION.get(
             CLICKHOUSE_URL,
             auth=(CLICKHOUSE_USER, CLICKHOUSE_PASSWORD),
             params={
@@ -55,13 +192,13 @@ def execute_clickhouse_query(query: str) -> List[Dict[str, Any]]:
         return rows
 
     except requests.exceptions.Timeout as e:
-        print(f"✗ ClickHouse timeout after 30s: {e}")
+        logger.error("✗ ClickHouse timeout after 30s: %s", e)
         return []
     except requests.exceptions.HTTPError as e:
-        print(f"✗ ClickHouse HTTP error {e.response.status_code}: {e.response.text}")
+        logger.error("✗ ClickHouse HTTP error %s: %s", e.response.status_code, e.response.text)
         return []
     except Exception as e:
-        print(f"✗ Unexpected error: {type(e).__name__}: {e}")
+        logger.error("✗ Unexpected error: %s: %s", type(e).__name__, e)
         return []
 
 
@@ -74,7 +211,8 @@ def query_undercurrents_trend(
     end_time: int,
     app_id: int,
     service_id: Optional[int] = None,
-    service_name: Optional[str] = None
+    service_name: Optional[str] = None,
+    client: Optional[Any] = None
 ) -> Dict[str, Any]:
     """
     UNDERCURRENTS_TREND: Find gradual drift and sudden changes
@@ -89,6 +227,7 @@ def query_undercurrents_trend(
         app_id: Application ID
         service_id: Optional service ID
         service_name: Optional service name
+        client: Optional native ClickHouse client (HTTP when None)
 
     Returns:
         Dictionary with drift and sudden change patterns
@@ -150,7 +289,7 @@ def query_undercurrents_trend(
     FORMAT JSONEachRow
     """
 
-    rows = execute_clickhouse_query(query)
+    rows = execute_clickhouse_query(query, client)
 
     return {
         "intent": "UNDERCURRENTS_TREND",
@@ -173,7 +312,8 @@ def query_capacity_risk(
     end_time: int,
     app_id: int,
     service_id: Optional[int] = None,
-    service_name: Optional[str] = None
+    service_name: Optional[str] = None,
+    client: Optional[Any] = None
 ) -> Dict[str, Any]:
     """
     CAPACITY_RISK: Find volume-driven patterns that indicate capacity issues
@@ -187,6 +327,7 @@ def query_capacity_risk(
         app_id: Application ID
         service_id: Optional service ID
         service_name: Optional service name
+        client: Optional native ClickHouse client (HTTP when None)
 
     Returns:
         Dictionary with volume-driven patterns
@@ -236,7 +377,7 @@ def query_capacity_risk(
     FORMAT JSONEachRow
     """
 
-    rows = execute_clickhouse_query(query)
+    rows = execute_clickhouse_query(query, client)
 
     # Categorize by baseline_state
     chronic = [r for r in rows if r.get('baseline_state') == 'CHRONIC']
@@ -271,7 +412,8 @@ def query_seasonality_pattern(
     end_time: int,
     app_id: int,
     service_id: Optional[int] = None,
-    service_name: Optional[str] = None
+    service_name: Optional[str] = None,
+    client: Optional[Any] = None
 ) -> Dict[str, Any]:
     """
     SEASONALITY_PATTERN: Find weekly recurring patterns (e.g., "Every Thursday issues?")
@@ -286,6 +428,7 @@ def query_seasonality_pattern(
         app_id: Application ID
         service_id: Optional service ID
         service_name: Optional service name
+        client: Optional native ClickHouse client (HTTP when None)
 
     Returns:
         Dictionary with weekly patterns grouped by day
@@ -334,7 +477,7 @@ def query_seasonality_pattern(
     FORMAT JSONEachRow
     """
 
-    rows = execute_clickhouse_query(query)
+    rows = execute_clickhouse_query(query, client)
 
     # Group by day of week
     day_names = {1: "Monday", 2: "Tuesday", 3: "Wednesday", 4: "Thursday",
@@ -370,7 +513,8 @@ def query_time_window_anomaly(
     end_time: int,
     app_id: int,
     service_id: Optional[int] = None,
-    service_name: Optional[str] = None
+    service_name: Optional[str] = None,
+    client: Optional[Any] = None
 ) -> Dict[str, Any]:
     """
     TIME_WINDOW_ANOMALY: Find daily recurring patterns (e.g., "Daily 4-5 PM problems?")
@@ -385,6 +529,7 @@ def query_time_window_anomaly(
         app_id: Application ID
         service_id: Optional service ID
         service_name: Optional service name
+        client: Optional native ClickHouse client (HTTP when None)
 
     Returns:
         Dictionary with daily patterns grouped by hour
@@ -433,7 +578,7 @@ def query_time_window_anomaly(
     FORMAT JSONEachRow
     """
 
-    rows = execute_clickhouse_query(query)
+    rows = execute_clickhouse_query(query, client)
 
     # Group by hour of day
     patterns_by_hour = {}
@@ -465,7 +610,8 @@ def query_recurring_incident(
     incident_timestamp: int,
     app_id: int,
     service_id: Optional[int] = None,
-    service_name: Optional[str] = None
+    service_name: Optional[str] = None,
+    client: Optional[Any] = None
 ) -> Dict[str, Any]:
     """
     RECURRING_INCIDENT: Find similar patterns before a given incident timestamp
@@ -480,6 +626,7 @@ def query_recurring_incident(
         app_id: Application ID
         service_id: Optional service ID
         service_name: Optional service name
+        client: Optional native ClickHouse client (HTTP when None)
 
     Returns:
         Dictionary with historical daily and weekly patterns
@@ -525,7 +672,7 @@ def query_recurring_incident(
     FORMAT JSONEachRow
     """
 
-    rows = execute_clickhouse_query(query)
+    rows = execute_clickhouse_query(query, client)
 
     # Separate by pattern type
     daily_patterns = [r for r in rows if r.get('pattern_type') == 'daily']
@@ -552,7 +699,8 @@ def query_historical_comparison(
     end_time: int,
     app_id: int,
     service_id: Optional[int] = None,
-    service_name: Optional[str] = None
+    service_name: Optional[str] = None,
+    client: Optional[Any] = None
 ) -> Dict[str, Any]:
     """
     HISTORICAL_COMPARISON: Compare current period with historical data
@@ -566,6 +714,7 @@ def query_historical_comparison(
         app_id: Application ID
         service_id: Optional service ID
         service_name: Optional service name
+        client: Optional native ClickHouse client (HTTP when None)
 
     Returns:
         Dictionary with comparison results
@@ -582,7 +731,8 @@ def query_risk_prediction(
     end_time: int,
     app_id: int,
     service_id: Optional[int] = None,
-    service_name: Optional[str] = None
+    service_name: Optional[str] = None,
+    client: Optional[Any] = None
 ) -> Dict[str, Any]:
     """
     RISK_PREDICTION: Predict potential failures based on patterns
@@ -596,6 +746,7 @@ def query_risk_prediction(
         app_id: Application ID
         service_id: Optional service ID
         service_name: Optional service name
+        client: Optional native ClickHouse client (HTTP when None)
 
     Returns:
         Dictionary with risk predictions
@@ -629,7 +780,8 @@ def dispatch_intent_query(
     app_id: int,
     service_id: Optional[int] = None,
     service_name: Optional[str] = None,
-    incident_timestamp: Optional[int] = None
+    incident_timestamp: Optional[int] = None,
+    client: Optional[Any] = None
 ) -> Dict[str, Any]:
     """
     Dispatch query to appropriate function based on intent
@@ -642,6 +794,7 @@ def dispatch_intent_query(
         service_id: Optional service ID
         service_name: Optional service name
         incident_timestamp: For RECURRING_INCIDENT only
+        client: Optional native ClickHouse client (HTTP when None)
 
     Returns:
         Query results from intent-specific function
@@ -658,10 +811,10 @@ def dispatch_intent_query(
     if intent == "RECURRING_INCIDENT":
         if not incident_timestamp:
             return {"error": "RECURRING_INCIDENT requires incident_timestamp"}
-        return query_function(incident_timestamp, app_id, service_id, service_name)
+        return query_function(incident_timestamp, app_id, service_id, service_name, client=client)
 
     # All other intents use start/end time
-    return query_function(start_time, end_time, app_id, service_id, service_name)
+    return query_function(start_time, end_time, app_id, service_id, service_name, client=client)
 
 
 # ========================================================================
@@ -669,6 +822,8 @@ def dispatch_intent_query(
 # ========================================================================
 
 if __name__ == "__main__":
+    # Script mode: show adapter progress messages as plain lines
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     from datetime import datetime, timedelta
     import pytz
 
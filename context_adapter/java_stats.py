@@ -4,30 +4,51 @@ Combines EB and RESPONSE data categories per service.
 Fetches data directly from API.
 """
 import json
+import hashlib
+import logging
+import time
 import requests
 import urllib3
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+
+# Access tokens reused until shortly before expiry:
+# (keycloak_url, client_id, username, sha256(password)) -> (token, expires_at)
+_TOKEN_CACHE: Dict[Tuple[str, str, str, str], Tuple[str, float]] = {}
+
+# Refresh tokens this many seconds before Keycloak's expires_in
+TOKEN_EXPIRY_MARGIN_SECONDS = 30
+
 
 def get_access_token(
     username: str,
     password: str,
     keycloak_url: str = "https://wm-sandbox-auth-1.watermelon.us/realms/watermelon/protocol/openid-connect/token",
-    client_id: str = "web_app"
+    client_id: str = "web_app",
+    session: Optional[requests.Session] = None
 ) -> Optional[str]:
     """
     Get access token from Keycloak authentication endpoint.
+    Tokens are cached per credential and reused until shortly before they expire.
 
     Args:
         username: Keycloak username
         password: Keycloak password
         keycloak_url: Keycloak token endpoint URL
         client_id: OAuth2 client ID
+        session: Optional pooled requests.Session (module-level requests otherwise)
 
     Returns:
         Access token string if successful, None otherwise
     """
+    cache_key = (keycloak_url, client_id, username, hashlib.sha256(password.encode('utf-8')).hexdigest())
+    cached = _TOKEN_CACHE.get(cache_key)
+    if cached and cached[1] > time.time():
+        return cached[0]
+
     # Prepare the request data
     data = {
         'grant_type': 'password',
@@ -45,7 +66,7 @@ def get_access_token(
         # Suppress SSL warnings
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-        response = requests.post(
+        response = (session or requests).post(
             keycloak_url,
             data=data,
             headers=headers,
@@ -57,24 +78,27 @@ def get_access_token(
         access_token = response_data.get('access_token')
 
         if access_token:
-            print("✓ Successfully obtained access token")
+            logger.info("✓ Successfully obtained access token")
+            expires_in = response_data.get('expires_in', 60)
+            _TOKEN_CACHE[cache_key] = (access_token, time.time() + expires_in - TOKEN_EXPIRY_MARGIN_SECONDS)
             return access_token
         else:
-            print("✗ No access_token found in response")
+            logger.error("✗ No access_token found in response")
             return None
 
     except Exception as e:
-        print(f"✗ Failed to get access token: {e}")
+        logger.error("✗ Failed to get access token: %s", e)
         return None
 
 
 def fetch_api_data(
-    start_time_ms: str,
-    end_time_ms: str,
+    start_time_ms: int,
+    end_time_ms: int,
     username: str,
     password: str,
     application_id: int,
-    index: str
+    index: str,
+    session: Optional[requests.Session] = None
 ) -> Optional[List[Dict]]:
     """
     Fetch transaction data directly from Watermelon API.
@@ -86,12 +110,13 @@ def fetch_api_data(
         password: Keycloak password
         application_id: Application ID (e.g., 31854 for WMPlatform)
         index: Time granularity (options: 'HOURLY', 'DAILY', 'WEEKLY', 'MONTHLY')
+        session: Optional pooled requests.Session (module-level requests otherwise)
 
     Returns:
         List of transaction records if successful, None otherwise
     """
     # Get access token
-    token = get_access_token(username, password)
+    token = get_access_token(username, password, session=session)
     if not token:
         return None
 
@@ -113,7 +138,7 @@ def fetch_api_data(
     try:
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-        response = requests.get(
+        response = (session or requests).get(
             transactions_url,
             params=params,
             headers=headers,
@@ -123,11 +148,11 @@ def fetch_api_data(
         response.raise_for_status()
         data = response.json()
 
-        print(f"✓ Successfully fetched {len(data)} records from API")
+        logger.info("✓ Successfully fetched %s records from API", len(data))
         return data
 
     except Exception as e:
-        print(f"✗ Failed to fetch data from API: {e}")
+        logger.error("✗ Failed to fetch data from API: %s", e)
         return None
 
 
@@ -201,14 +226,14 @@ def transform_response_service(response_record: Dict) -> Dict[str, Any]:
     }
 
 
-def transform_to_llm_format(raw_data: List[Dict], start_time_ms: str, end_time_ms: str) -> Dict[str, Any]:
+def transform_to_llm_format(raw_data: List[Dict], start_time_ms: int, end_time_ms: int) -> Dict[str, Any]:
     """
     Transform raw API response to LLM-ready format with separate EB and RESPONSE arrays.
 
     Args:
         raw_data: List of transaction records from API
-        start_time_ms: Start time in milliseconds (string)
-        end_time_ms: End time in milliseconds (string)
+        start_time_ms: Start time in milliseconds
+        end_time_ms: End time in milliseconds
 
     Returns:
         LLM-ready formatted dictionary with 4 separate arrays
@@ -244,8 +269,8 @@ def transform_to_llm_format(raw_data: List[Dict], start_time_ms: str, end_time_m
     response_at_risk.sort(key=lambda x: x["volume"]["total_requests"], reverse=True)
 
     # Convert timestamps to readable dates
-    start_date = datetime.fromtimestamp(int(start_time_ms) / 1000).strftime("%Y-%m-%d")
-    end_date = datetime.fromtimestamp(int(end_time_ms) / 1000).strftime("%Y-%m-%d")
+    start_date = datetime.fromtimestamp(start_time_ms / 1000).strftime("%Y-%m-%d")
+    end_date = datetime.fromtimestamp(end_time_ms / 1000).strftime("%Y-%m-%d")
 
     # Get application name and granularity from first record
     application_name = raw_data[0].get("applicationName", "WMPlatform") if raw_data else "WMPlatform"
@@ -282,11 +307,12 @@ def transform_to_llm_format(raw_data: List[Dict], start_time_ms: str, end_time_m
 
 def get_current_health(
     app_id: int,
-    start_time: str,
-    end_time: str,
+    start_time: int,
+    end_time: int,
     index: str,
     username: str,
-    password: str
+    password: str,
+    session: Optional[requests.Session] = None
 ) -> Optional[Dict[str, Any]]:
     """
     CURRENT_HEALTH intent handler.
@@ -294,18 +320,19 @@ def get_current_health(
 
     Args:
         app_id: Application ID
-        start_time: Start time in Unix milliseconds (string)
-        end_time: End time in Unix milliseconds (string)
+        start_time: Start time in Unix milliseconds
+        end_time: End time in Unix milliseconds
         index: Time granularity (HOURLY, DAILY, WEEKLY, MONTHLY)
         username: Keycloak username
         password: Keycloak password
+        session: Optional pooled requests.Session
 
     Returns:
         Dictionary with 4 arrays (unhealthy_services_eb, at_risk_services_eb,
         unhealthy_services_response, at_risk_services_response) for all services
         within the time range, or None if failed
     """
-    print(f"📊 CURRENT_HEALTH: Fetching application-wide health (app_id={app_id})")
+    logger.info("📊 CURRENT_HEALTH: Fetching application-wide health (app_id=%s)", app_id)
 
     # Fetch raw data from API
     raw_data = fetch_api_data(
@@ -314,28 +341,30 @@ def get_current_health(
         username=username,
         password=password,
         application_id=app_id,
-        index=index
+        index=index,
+        session=session
     )
 
     if not raw_data:
-        print("✗ Failed to fetch data for CURRENT_HEALTH")
+        logger.error("✗ Failed to fetch data for CURRENT_HEALTH")
         return None
 
     # Transform to LLM format (returns all services)
     result = transform_to_llm_format(raw_data, start_time, end_time)
-    print(f"✓ CURRENT_HEALTH: Returned {result['stats']['total_slos']} services")
+    logger.info("✓ CURRENT_HEALTH: Returned %s services", result['stats']['total_slos'])
 
     return result
 
 
 def get_service_health(
     app_id: int,
-    start_time: str,
-    end_time: str,
+    start_time: int,
+    end_time: int,
     service_id: Optional[int],
     index: str,
     username: str,
-    password: str
+    password: str,
+    session: Optional[requests.Session] = None
 ) -> Optional[Dict[str, Any]]:
     """
     SERVICE_HEALTH intent handler.
@@ -343,12 +372,13 @@ def get_service_health(
 
     Args:
         app_id: Application ID
-        start_time: Start time in Unix milliseconds (string)
-        end_time: End time in Unix milliseconds (string)
+        start_time: Start time in Unix milliseconds
+        end_time: End time in Unix milliseconds
         service_id: Service ID (required - function returns None if not provided)
         index: Time granularity (HOURLY, DAILY, WEEKLY, MONTHLY)
         username: Keycloak username
         password: Keycloak password
+        session: Optional pooled requests.Session
 
     Returns:
         Dictionary with health data filtered for the specific service,
@@ -356,10 +386,10 @@ def get_service_health(
     """
     # Check if service_id is provided
     if service_id is None:
-        print("⚠️  SERVICE_HEALTH: service_id not provided, skipping")
+        logger.warning("⚠️  SERVICE_HEALTH: service_id not provided, skipping")
         return None
 
-    print(f"📊 SERVICE_HEALTH: Fetching health for service_id={service_id}")
+    logger.info("📊 SERVICE_HEALTH: Fetching health for service_id=%s", service_id)
 
     # Fetch raw data from API
     raw_data = fetch_api_data(
@@ -368,24 +398,25 @@ def get_service_health(
         username=username,
         password=password,
         application_id=app_id,
-        index=index
+        index=index,
+        session=session
     )
 
     if not raw_data:
-        print("✗ Failed to fetch data for SERVICE_HEALTH")
+        logger.error("✗ Failed to fetch data for SERVICE_HEALTH")
         return None
 
     # Filter raw_data to only include records matching service_id
     filtered_data = [record for record in raw_data if record.get("transactionId") == service_id]
 
     if not filtered_data:
-        print(f"⚠️  SERVICE_HEALTH: No data found for service_id={service_id}")
+        logger.warning("⚠️  SERVICE_HEALTH: No data found for service_id=%s", service_id)
         return {
             "application": raw_data[0].get("applicationName", "WMPlatform") if raw_data else "WMPlatform",
             "service_id": service_id,
             "window": {
-                "start": datetime.fromtimestamp(int(start_time) / 1000).strftime("%Y-%m-%d"),
-                "end": datetime.fromtimestamp(int(end_time) / 1000).strftime("%Y-%m-%d"),
+                "start": datetime.fromtimestamp(start_time / 1000).strftime("%Y-%m-%d"),
+                "end": datetime.fromtimestamp(end_time / 1000).strftime("%Y-%m-%d"),
                 "granularity": index
             },
             "stats": {
@@ -403,19 +434,20 @@ def get_service_health(
     # Transform filtered data
     result = transform_to_llm_format(filtered_data, start_time, end_time)
     result["service_id"] = service_id
-    print(f"✓ SERVICE_HEALTH: Returned {len(filtered_data)} records for service_id={service_id}")
+    logger.info("✓ SERVICE_HEALTH: Returned %s records for service_id=%s", len(filtered_data), service_id)
 
     return result
 
 
 def get_error_budget_status(
     app_id: int,
-    start_time: str,
-    end_time: str,
+    start_time: int,
+    end_time: int,
     index: str,
     username: str,
     password: str,
-    service_id: Optional[int] = None
+    service_id: Optional[int] = None,
+    session: Optional[requests.Session] = None
 ) -> Optional[Dict[str, Any]]:
     """
     ERROR_BUDGET_STATUS intent handler.
@@ -423,21 +455,22 @@ def get_error_budget_status(
 
     Args:
         app_id: Application ID
-        start_time: Start time in Unix milliseconds (string)
-        end_time: End time in Unix milliseconds (string)
+        start_time: Start time in Unix milliseconds
+        end_time: End time in Unix milliseconds
         index: Time granularity (HOURLY, DAILY, WEEKLY, MONTHLY)
         username: Keycloak username
         password: Keycloak password
         service_id: Optional service ID to filter by specific service
+        session: Optional pooled requests.Session
 
     Returns:
         Dictionary with error budget data (EB category only),
         or None if fetch failed
     """
     if service_id:
-        print(f"📊 ERROR_BUDGET_STATUS: Fetching EB for service_id={service_id}")
+        logger.info("📊 ERROR_BUDGET_STATUS: Fetching EB for service_id=%s", service_id)
     else:
-        print(f"📊 ERROR_BUDGET_STATUS: Fetching EB for all services (app_id={app_id})")
+        logger.info("📊 ERROR_BUDGET_STATUS: Fetching EB for all services (app_id=%s)", app_id)
 
     # Fetch raw data from API
     raw_data = fetch_api_data(
@@ -446,31 +479,32 @@ def get_error_budget_status(
         username=username,
         password=password,
         application_id=app_id,
-        index=index
+        index=index,
+        session=session
     )
 
     if not raw_data:
-        print("✗ Failed to fetch data for ERROR_BUDGET_STATUS")
+        logger.error("✗ Failed to fetch data for ERROR_BUDGET_STATUS")
         return None
 
     # Filter by service_id if provided
     if service_id:
         raw_data = [record for record in raw_data if record.get("transactionId") == service_id]
         if not raw_data:
-            print(f"⚠️  ERROR_BUDGET_STATUS: No data found for service_id={service_id}")
+            logger.warning("⚠️  ERROR_BUDGET_STATUS: No data found for service_id=%s", service_id)
             return None
 
     # Filter to only EB category records
     eb_records = [record for record in raw_data if record.get("dataCategory") == "EB"]
 
     if not eb_records:
-        print("⚠️  ERROR_BUDGET_STATUS: No EB records found")
+        logger.warning("⚠️  ERROR_BUDGET_STATUS: No EB records found")
         return {
             "application": raw_data[0].get("applicationName", "WMPlatform") if raw_data else "WMPlatform",
             "service_id": service_id,
             "window": {
-                "start": datetime.fromtimestamp(int(start_time) / 1000).strftime("%Y-%m-%d"),
-                "end": datetime.fromtimestamp(int(end_time) / 1000).strftime("%Y-%m-%d"),
+                "start": datetime.fromtimestamp(start_time / 1000).strftime("%Y-%m-%d"),
+                "end": datetime.fromtimestamp(end_time / 1000).strftime("%Y-%m-%d"),
                 "granularity": index
             },
             "stats": {
@@ -501,8 +535,8 @@ def get_error_budget_status(
     result = {
         "application": eb_records[0].get("applicationName", "WMPlatform"),
         "window": {
-            "start": datetime.fromtimestamp(int(start_time) / 1000).strftime("%Y-%m-%d"),
-            "end": datetime.fromtimestamp(int(end_time) / 1000).strftime("%Y-%m-%d"),
+            "start": datetime.fromtimestamp(start_time / 1000).strftime("%Y-%m-%d"),
+            "end": datetime.fromtimestamp(end_time / 1000).strftime("%Y-%m-%d"),
             "granularity": index
         },
         "stats": {
@@ -519,12 +553,14 @@ def get_error_budget_status(
     if service_id:
         result["service_id"] = service_id
 
-    print(f"✓ ERROR_BUDGET_STATUS: Returned {len(eb_services)} EB services")
+    logger.info("✓ ERROR_BUDGET_STATUS: Returned %s EB services", len(eb_services))
 
     return result
 
 
 if __name__ == "__main__":
+    # Script mode: show adapter progress messages as plain lines
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     print("Fetching and Transforming API Data to LLM Format")
     print("=" * 50)
 
@@ -535,8 +571,8 @@ if __name__ == "__main__":
     index = 'DAILY'
 
     # Time range (Unix timestamps in milliseconds)
-    start_time = '1768049277620'
-    end_time = '1770641277620'
+    start_time = 1768049277620
+    end_time = 1770641277620
 
     # Fetch data from API
     print("\n--- Fetching data from API ---")
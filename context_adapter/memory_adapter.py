@@ -5,10 +5,13 @@ Includes intent-based routing for pattern-specific queries
 """
 
 import json
+import logging
 import requests
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Set
 from datetime import datetime
-from .intent_based_queries import dispatch_intent_query
+from .intent_based_queries import CLICKHOUSE_SESSION, dispatch_intent_query, iter_native_query
+
+logger = logging.getLogger(__name__)
 
 
 # -------------------------------------------------------------------
@@ -33,23 +36,28 @@ def ms_to_datetime_str(timestamp_ms: int) -> str:
 # ClickHouse fetch
 # -------------------------------------------------------------------
 
-def fetch_behavior_service_memory(
+def iter_behavior_service_memory(
     start_time: int,
     end_time: int,
     app_id: int,
-    sid: Optional[str] = None
-) -> List[Dict[str, Any]]:
+    sid: Optional[str] = None,
+    client: Optional[Any] = None
+) -> Iterator[Dict[str, Any]]:
     """
-    Fetch behavior service memory records from ClickHouse for specific application and service
+    Stream behavior service memory records from ClickHouse for specific application and service
+
+    Rows are decoded as they arrive (native blocks or JSONEachRow lines), so consumers
+    can aggregate without an intermediate list.
 
     Args:
         start_time: Start time in Unix milliseconds
         end_time: End time in Unix milliseconds
         app_id: Application ID
         sid: Service name (optional - if None, fetches all services for the app)
+        client: Optional native ClickHouse client (HTTP when None or unreachable)
 
-    Returns:
-        List of behavior memory records
+    Yields:
+        Behavior memory records
     """
 
     clickhouse_url = "http://ec2-47-129-241-41.ap-southeast-1.compute.amazonaws.com:8123"
@@ -93,65 +101,101 @@ def fetch_behavior_service_memory(
     FORMAT JSONEachRow
     """
 
+    count = 0
+
+    # Native protocol first when a client is provided
+    if client is not None:
+        rows_iter = iter_native_query(client, query)
+        if rows_iter is not None:
+            for row in rows_iter:
+                count += 1
+                yield row
+            logger.info("✓ Fetched %s behavior records", count)
+            return
+
     try:
-        response = requests.get(
+        response = CLICKHOUSE_SESSION.get(
             clickhouse_url,
             auth=auth,
             params={
                 "query": query.strip(),
                 "database": "metrics"
             },
-            timeout=30
+            timeout=30,
+            stream=True
         )
         response.raise_for_status()
 
-        rows = [
-            json.loads(line)
-            for line in response.text.strip().split("\n")
-            if line.strip()
-        ]
+        # Parse JSONEachRow format line by line
+        with response:
+            for line in response.iter_lines():
+                if line.strip():
+                    count += 1
+                    yield json.loads(line)
 
-        print(f"✓ Fetched {len(rows)} behavior records")
-        return rows
+        logger.info("✓ Fetched %s behavior records", count)
 
     except requests.exceptions.Timeout as e:
-        print(f"✗ ClickHouse timeout after 30s: {e}")
+        logger.error("✗ ClickHouse timeout after 30s: %s", e)
         raise
     except requests.exceptions.ConnectionError as e:
-        print(f"✗ Cannot connect to ClickHouse: {e}")
+        logger.error("✗ Cannot connect to ClickHouse: %s", e)
         raise
     except requests.exceptions.HTTPError as e:
         if e.response.status_code == 401:
-            print(f"✗ ClickHouse authentication failed - check credentials")
+            logger.error("✗ ClickHouse authentication failed - check credentials")
         elif e.response.status_code == 400:
-            print(f"✗ Invalid SQL query: {e.response.text}")
+            logger.error("✗ Invalid SQL query: %s", e.response.text)
         else:
-            print(f"✗ ClickHouse HTTP error {e.response.status_code}: {e.response.text}")
+            logger.error("✗ ClickHouse HTTP error %s: %s", e.response.status_code, e.response.text)
         raise
     except json.JSONDecodeError as e:
-        print(f"✗ Failed to parse ClickHouse response as JSON: {e}")
+        logger.error("✗ Failed to parse ClickHouse response as JSON: %s", e)
         raise
     except Exception as e:
-        print(f"✗ Unexpected error: {type(e).__name__}: {e}")
+        logger.error("✗ Unexpected error: %s: %s", type(e).__name__, e)
         raise
 
 
+def fetch_behavior_service_memory(
+    start_time: int,
+    end_time: int,
+    app_id: int,
+    sid: Optional[str] = None,
+    client: Optional[Any] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fetch behavior service memory records from ClickHouse for specific application and service
+
+    Args:
+        start_time: Start time in Unix milliseconds
+        end_time: End time in Unix milliseconds
+        app_id: Application ID
+        sid: Service name (optional - if None, fetches all services for the app)
+        client: Optional native ClickHouse client (HTTP when None or unreachable)
+
+    Returns:
+        List of behavior memory records
+    """
+    return list(iter_behavior_service_memory(start_time, end_time, app_id, sid, client))
+
+
 # -------------------------------------------------------------------
 # Transform to LLM format
 # -------------------------------------------------------------------
 
 def transform_behavior_memory(
-    rows: List[Dict[str, Any]],
+    rows: Iterable[Dict[str, Any]],
     start_time: int,
     end_time: int,
     app_id: int,
     sid: Optional[str] = None
 ) -> Dict[str, Any]:
     """
-    Transform behavior memory records to LLM-ready format
+    Transform behavior memory records to LLM-ready format in a single pass
 
     Args:
-        rows: List of raw behavior memory records from ClickHouse
+        rows: Raw behavior memory records from ClickHouse (list or streaming iterator)
         start_time: Start time in Unix milliseconds
         end_time: End time in Unix milliseconds
         app_id: Application ID
@@ -171,13 +215,16 @@ def transform_behavior_memory(
     services = set()
     patterns = []
     skipped_records = 0
+    total_rows = 0
+    state_counts = {"CHRONIC": 0, "AT_RISK": 0, "HEALTHY": 0}
 
     for i, r in enumerate(rows):
+        total_rows += 1
         # Validate required fields exist
         missing_fields = [field for field in REQUIRED_FIELDS if field not in r]
 
         if missing_fields:
-            print(f"⚠ Warning: Record {i} missing fields {missing_fields}, skipping...")
+            logger.warning("⚠ Warning: Record %s missing fields %s, skipping...", i, missing_fields)
             skipped_records += 1
             continue
 
@@ -209,20 +256,24 @@ def transform_behavior_memory(
                 "detected_at": r["detected_at"]
             })
 
+            # Running per-state counts (no second pass over patterns)
+            if r["baseline_state"] in state_counts:
+                state_counts[r["baseline_state"]] += 1
+
         except (KeyError, TypeError, ValueError) as e:
-            print(f"⚠ Warning: Error processing record {i}: {e}, skipping...")
+            logger.warning("⚠ Warning: Error processing record %s: %s, skipping...", i, e)
             skipped_records += 1
             continue
 
     if skipped_records > 0:
-        print(f"⚠ Skipped {skipped_records} invalid records out of {len(rows)}")
+        logger.warning("⚠ Skipped %s invalid records out of %s", skipped_records, total_rows)
 
     stats = {
         "total_records": len(patterns),
         "services_affected": len(services),
-        "chronic": sum(1 for p in patterns if p["baseline_state"] == "CHRONIC"),
-        "at_risk": sum(1 for p in patterns if p["baseline_state"] == "AT_RISK"),
-        "healthy": sum(1 for p in patterns if p["baseline_state"] == "HEALTHY")
+        "chronic": state_counts["CHRONIC"],
+        "at_risk": state_counts["AT_RISK"],
+        "healthy": state_counts["HEALTHY"]
     }
 
     # Convert timestamps to readable format for display
@@ -255,7 +306,8 @@ def fetch_patterns_by_intent(
     app_id: int,
     service_id: Optional[int] = None,
     service_name: Optional[str] = None,
-    incident_timestamp: Optional[int] = None
+    incident_timestamp: Optional[int] = None,
+    client: Optional[Any] = None
 ) -> Dict[str, Any]:
     """
     Orchestrator-facing function that routes to appropriate intent-based queries
@@ -270,6 +322,7 @@ def fetch_patterns_by_intent(
         service_id: Optional service ID (resolved from service name)
         service_name: Optional service name (raw from intent classifier)
         incident_timestamp: Optional incident timestamp for RECURRING_INCIDENT
+        client: Optional shared native ClickHouse client (HTTP when None)
 
     Returns:
         Dictionary with results from all applicable intent queries
@@ -290,12 +343,12 @@ def fetch_patterns_by_intent(
 
     if not intents_to_query:
         # No pattern intents, use general fetch
-        print("   No pattern-specific intents detected, using general query")
-        rows = fetch_behavior_service_memory(start_time, end_time, app_id, service_name)
+        logger.info("   No pattern-specific intents detected, using general query")
+        rows = iter_behavior_service_memory(start_time, end_time, app_id, service_name, client=client)
         return transform_behavior_memory(rows, start_time, end_time, app_id, service_name)
 
     # Execute intent-specific queries
-    print(f"   Pattern intents detected: {', '.join(intents_to_query)}")
+    logger.info("   Pattern intents detected: %s", ', '.join(intents_to_query))
 
     results = {
         "intents_queried": list(intents_to_query),
@@ -303,7 +356,7 @@ def fetch_patterns_by_intent(
     }
 
     for intent in intents_to_query:
-        print(f"   → Querying {intent}...")
+        logger.info("   → Querying %s...", intent)
 
         try:
             result = dispatch_intent_query(
@@ -313,20 +366,21 @@ def fetch_patterns_by_intent(
                 app_id=app_id,
                 service_id=service_id,
                 service_name=service_name,
-                incident_timestamp=incident_timestamp
+                incident_timestamp=incident_timestamp,
+                client=client
             )
 
             results["intent_results"][intent] = result
 
             # Print summary
             if result.get('status') == 'under_progress':
-                print(f"      {result.get('message')}")
+                logger.info("      %s", result.get('message'))
             else:
                 record_count = result.get('total_records', 0)
-                print(f"      Found {record_count} records")
+                logger.info("      Found %s records", record_count)
 
         except Exception as e:
-            print(f"      Error querying {intent}: {e}")
+            logger.error("      Error querying %s: %s", intent, e)
             results["intent_results"][intent] = {
                 "error": str(e),
                 "intent": intent
@@ -340,6 +394,8 @@ def fetch_patterns_by_intent(
 # -------------------------------------------------------------------
 
 if __name__ == "__main__":
+    # Script mode: show adapter progress messages as plain lines
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     # Example usage
     # Time range: Last 30 days from now
     from datetime import datetime, timedelta
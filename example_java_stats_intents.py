@@ -27,8 +27,8 @@ APP_ID = 31854
 INDEX = 'DAILY'
 
 # Time range (last 7 days) - replace with actual timestamps
-START_TIME = '1768049277620'  # Replace with actual start time
-END_TIME = '1770641277620'    # Replace with actual end time
+START_TIME = 1768049277620  # Replace with actual start time
+END_TIME = 1770641277620      # Replace with actual end time
 
 
 def example_current_health():
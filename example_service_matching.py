@@ -4,7 +4,21 @@ Example: How to use ServiceMatcher with Intent Classifier
 Shows integration between intent classification and service ID resolution
 """
 
-from utils.service_matcher import ServiceMatcher
+import os
+
+from utils.service_matcher import get_service_matcher
+
+# Detailed per-match output and section banners only when SLO_VERBOSE is set
+VERBOSE = bool(os.environ.get("SLO_VERBOSE"))
+
+
+def _banner(title: str) -> None:
+    """Print a section banner (no-op unless SLO_VERBOSE is set)"""
+    if not VERBOSE:
+        return
+    print("\n" + "=" * 80)
+    print(title)
+    print("=" * 80)
 
 
 def example_integration():
@@ -14,50 +28,45 @@ def example_integration():
     """
 
     # Initialize service matcher
-    matcher = ServiceMatcher("services.yaml")
+    matcher = get_service_matcher("services.yaml")
     print(f"Loaded {len(matcher.services_by_id)} services\n")
 
     # ========================================================================
     # Example 1: Simple service name matching
     # ========================================================================
-    print("=" * 80)
-    print("Example 1: Match 'dashboard-stats'")
-    print("=" * 80)
+    _banner("Example 1: Match 'dashboard-stats'")
 
     service_name = "dashboard-stats"
     matches = matcher.find_matches(service_name, threshold=0.3, max_results=5)
 
-    print(f"\nFound {len(matches)} matches for '{service_name}':")
-    for match in matches:
-        print(f"  • Service ID: {match['service_id']}")
-        print(f"    Path: {match['service_path']}")
-        print(f"    Score: {match['similarity_score']:.3f}")
-        print()
+    print(f"\nFound {len(matches)} matches for '{service_name}'")
+    if VERBOSE:
+        for match in matches:
+            print(f"  • Service ID: {match['service_id']}")
+            print(f"    Path: {match['service_path']}")
+            print(f"    Score: {match['similarity_score']:.3f}")
+            print()
 
     # ========================================================================
     # Example 2: Get best match only
     # ========================================================================
-    print("=" * 80)
-    print("Example 2: Get best match for 'wmebonboarding'")
-    print("=" * 80)
+    _banner("Example 2: Get best match for 'wmebonboarding'")
 
     service_name = "wmebonboarding"
     best_match = matcher.find_best_match(service_name)
 
     if best_match:
-        print(f"\nBest match:")
-        print(f"  Service ID: {best_match['service_id']}")
-        print(f"  Path: {best_match['service_path']}")
-        print(f"  Score: {best_match['similarity_score']:.3f}")
+        print(f"\nBest match: service_id={best_match['service_id']}")
+        if VERBOSE:
+            print(f"  Path: {best_match['service_path']}")
+            print(f"  Score: {best_match['similarity_score']:.3f}")
     else:
         print("No match found")
 
     # ========================================================================
     # Example 3: Simulate intent classifier output
     # ========================================================================
-    print("\n" + "=" * 80)
-    print("Example 3: Simulate Intent Classifier Integration")
-    print("=" * 80)
+    _banner("Example 3: Simulate Intent Classifier Integration")
 
     # Simulated output from intent classifier
     intent_classifier_output = {
@@ -74,18 +83,17 @@ def example_integration():
     # Match to actual service IDs
     matches = matcher.find_matches(extracted_service, threshold=0.3, max_results=3)
 
-    print(f"\nMatched to {len(matches)} service(s):")
-    for i, match in enumerate(matches, 1):
-        print(f"\n{i}. Service ID: {match['service_id']}")
-        print(f"   Path: {match['service_path']}")
-        print(f"   Score: {match['similarity_score']:.3f}")
+    print(f"\nMatched to {len(matches)} service(s)")
+    if VERBOSE:
+        for i, match in enumerate(matches, 1):
+            print(f"\n{i}. Service ID: {match['service_id']}")
+            print(f"   Path: {match['service_path']}")
+            print(f"   Score: {match['similarity_score']:.3f}")
 
     # ========================================================================
     # Example 4: Use service IDs in adapter calls
     # ========================================================================
-    print("\n" + "=" * 80)
-    print("Example 4: Using Service IDs in Adapter Calls")
-    print("=" * 80)
+    _banner("Example 4: Using Service IDs in Adapter Calls")
 
     service_name = "mobile-devices"
     matches = matcher.find_matches(service_name, max_results=2)
@@ -94,6 +102,7 @@ def example_integration():
         print(f"\nFor service query '{service_name}':")
         print(f"Found {len(matches)} matching services")
 
+    if matches and VERBOSE:
         for match in matches:
             service_id = match['service_id']
             print(f"\n  → Would call Java Stats API with:")
@@ -104,14 +113,12 @@ def example_integration():
     # ========================================================================
     # Example 5: Fallback when no service specified
     # ========================================================================
-    print("\n" + "=" * 80)
-    print("Example 5: Handle queries without specific service name")
-    print("=" * 80)
+    _banner("Example 5: Handle queries without specific service name")
 
     # When intent classifier returns service=None
     extracted_service = None
 
-    if not extracted_service:
+    if not extracted_service and VERBOSE:
         print("\nNo specific service extracted by intent classifier")
         print("→ Fetch data for ALL services (application-level query)")
         print("→ Use application_id=31854 without service_id filter")
@@ -121,20 +128,26 @@ def example_orchestrator_integration():
     """
     Example showing how to modify orchestrator to use service matching
     """
-    print("\n" + "=" * 80)
-    print("ORCHESTRATOR INTEGRATION EXAMPLE")
-    print("=" * 80)
+    _banner("ORCHESTRATOR INTEGRATION EXAMPLE")
+
+    if not VERBOSE:
+        return
 
     print("""
 In your orchestrator.py, add this logic after intent classification:
 
 ```python
-from utils.service_matcher import ServiceMatcher
+import logging
+
+from utils.service_matcher import get_service_matcher
+
+logger = logging.getLogger(__name__)
 
 class SLOOrchestrator:
     def __init__(self):
         # ... existing code ...
-        self.service_matcher = ServiceMatcher("services.yaml")
+        # Shared across orchestrators - services.yaml is parsed once per process
+        self.service_matcher = get_service_matcher("services.yaml")
 
     def process_query(self, user_query: str):
         # Step 1: Classify intent
@@ -153,7 +166,7 @@ class SLOOrchestrator:
                 max_results=5
             )
             matched_services = [m['service_id'] for m in matches]
-            print(f"Matched '{service_name}' to service IDs: {matched_services}")
+            logger.debug("Matched %r to service IDs: %s", service_name, matched_services)
 
         # Step 4: Pass service IDs to adapters
         if matched_services:
@@ -4,16 +4,27 @@ Example usage of the SLO Orchestrator
 Shows how to use the orchestrator programmatically
 """
 
+import os
 import json
 from orchestrator import SLOOrchestrator
 
+# Detailed result output and section banners only when SLO_VERBOSE is set
+VERBOSE = bool(os.environ.get("SLO_VERBOSE"))
 
-def example_basic_query():
-    """Example 1: Basic query"""
+
+def _banner(title: str) -> None:
+    """Print a section banner (no-op unless SLO_VERBOSE is set)"""
+    if not VERBOSE:
+        return
     print("\n" + "="*80)
-    print("EXAMPLE 1: Basic Health Query")
+    print(title)
     print("="*80)
 
+
+def example_basic_query():
+    """Example 1: Basic query"""
+    _banner("EXAMPLE 1: Basic Health Query")
+
     orchestrator = SLOOrchestrator()
     result = orchestrator.process_query("What is the health status in the past 7 days?")
 
@@ -23,7 +34,7 @@ def example_basic_query():
         print(f"Data Sources Used: {result['data_sources_used']}")
 
         # Access java_stats_api data
-        if 'java_stats_api' in result['data']:
+        if VERBOSE and 'java_stats_api' in result['data']:
             java_data = result['data']['java_stats_api']
             stats = java_data.get('stats', {})
             print(f"\nJava Stats Summary:")
@@ -33,7 +44,7 @@ def example_basic_query():
             print(f"  - Healthy: {stats.get('healthy_slo', 0)}")
 
         # Access clickhouse data
-        if 'clickhouse' in result['data']:
+        if VERBOSE and 'clickhouse' in result['data']:
             ch_data = result['data']['clickhouse']
             print(f"\nClickHouse Summary:")
             print(f"  - Total Patterns: {ch_data.get('total_patterns', 0)}")
@@ -43,9 +54,7 @@ def example_basic_query():
 
 def example_specific_service():
     """Example 2: Query for a specific service"""
-    print("\n" + "="*80)
-    print("EXAMPLE 2: Specific Service Query")
-    print("="*80)
+    _banner("EXAMPLE 2: Specific Service Query")
 
     orchestrator = SLOOrchestrator()
 
@@ -58,15 +67,14 @@ def example_specific_service():
 
     if result.get('success'):
         print("\n✅ Query successful!")
-        print(f"Service: {result['metadata'].get('service', 'N/A')}")
-        print(f"Time Range: {result['time_resolution']['time_range']}")
+        if VERBOSE:
+            print(f"Service: {result['metadata'].get('service', 'N/A')}")
+            print(f"Time Range: {result['time_resolution']['time_range']}")
 
 
 def example_export_to_json():
     """Example 3: Export result to JSON file"""
-    print("\n" + "="*80)
-    print("EXAMPLE 3: Export to JSON")
-    print("="*80)
+    _banner("EXAMPLE 3: Export to JSON")
 
     orchestrator = SLOOrchestrator()
     result = orchestrator.process_query("What services are unhealthy today?")
@@ -85,9 +93,7 @@ def example_export_to_json():
 
 def example_access_raw_data():
     """Example 4: Access raw adapter data"""
-    print("\n" + "="*80)
-    print("EXAMPLE 4: Access Raw Adapter Data")
-    print("="*80)
+    _banner("EXAMPLE 4: Access Raw Adapter Data")
 
     orchestrator = SLOOrchestrator()
     result = orchestrator.process_query("Show burn rate trends for the past 7 days")
@@ -97,13 +103,14 @@ def example_access_raw_data():
 
         # Access unhealthy services with EB issues
         unhealthy_eb = java_data.get('unhealthy_services_eb', [])
-        print(f"\n🔴 Unhealthy Services (Error Budget):")
-        for service in unhealthy_eb[:3]:  # Show top 3
-            print(f"\n  Service: {service['service']}")
-            print(f"    Health: {service['health']}")
-            print(f"    Success Rate: {service['success']['rate']}%")
-            print(f"    P95 Latency: {service['latency']['p95']}ms")
-            print(f"    Burn Rate: {service['risk']['burn_rate']}")
+        print(f"\n🔴 Unhealthy Services (Error Budget): {len(unhealthy_eb)}")
+        if VERBOSE:
+            for service in unhealthy_eb[:3]:  # Show top 3
+                print(f"\n  Service: {service['service']}")
+                print(f"    Health: {service['health']}")
+                print(f"    Success Rate: {service['success']['rate']}%")
+                print(f"    P95 Latency: {service['latency']['p95']}ms")
+                print(f"    Burn Rate: {service['risk']['burn_rate']}")
 
         # Access at-risk services
         at_risk_eb = java_data.get('at_risk_services_eb', [])
@@ -112,9 +119,7 @@ def example_access_raw_data():
 
 def example_multiple_queries():
     """Example 5: Multiple queries in sequence"""
-    print("\n" + "="*80)
-    print("EXAMPLE 5: Multiple Queries")
-    print("="*80)
+    _banner("EXAMPLE 5: Multiple Queries")
 
     orchestrator = SLOOrchestrator()
 
@@ -126,10 +131,13 @@ def example_multiple_queries():
 
     results = []
     for query in queries:
-        print(f"\n📝 Processing: {query}")
+        if VERBOSE:
+            print(f"\n📝 Processing: {query}")
         result = orchestrator.process_query(query)
         results.append(result)
 
+        if not VERBOSE:
+            continue
         if result.get('success'):
             print(f"   ✅ Intent: {result['classification']['primary_intent']}")
         else:
@@ -140,9 +148,7 @@ def example_multiple_queries():
 
 def example_error_handling():
     """Example 6: Error handling"""
-    print("\n" + "="*80)
-    print("EXAMPLE 6: Error Handling")
-    print("="*80)
+    _banner("EXAMPLE 6: Error Handling")
 
     orchestrator = SLOOrchestrator()
 
@@ -151,18 +157,19 @@ def example_error_handling():
 
     if not result.get('success'):
         print(f"❌ Query failed as expected: {result.get('error')}")
-        print("This demonstrates the error handling mechanism")
+        if VERBOSE:
+            print("This demonstrates the error handling mechanism")
     else:
         print("⚠️  Query succeeded unexpectedly")
-        print("The LLM was able to interpret the unclear query")
+        if VERBOSE:
+            print("The LLM was able to interpret the unclear query")
 
 
 if __name__ == "__main__":
-    print("\n" + "="*80)
-    print("SLO ORCHESTRATOR - USAGE EXAMPLES")
-    print("="*80)
-    print("\nThese examples demonstrate different ways to use the orchestrator")
-    print("Run each example individually by uncommenting the function call\n")
+    _banner("SLO ORCHESTRATOR - USAGE EXAMPLES")
+    if VERBOSE:
+        print("\nThese examples demonstrate different ways to use the orchestrator")
+        print("Run each example individually by uncommenting the function call\n")
 
     try:
         # Run examples
@@ -175,9 +182,7 @@ if __name__ == "__main__":
         # example_multiple_queries()
         # example_error_handling()
 
-        print("\n" + "="*80)
-        print("✅ Examples completed!")
-        print("="*80 + "\n")
+        _banner("✅ Examples completed!")
 
     except Exception as e:
         print(f"\n❌ Error running examples: {e}")
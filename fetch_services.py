@@ -4,12 +4,19 @@ Service Mapping Fetcher
 Fetches all distinct services for an application from ClickHouse and creates a service mapping YAML file
 """
 
+import functools
 import requests
-import json
+import orjson
 import yaml
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Iterator
 from collections import defaultdict
 
+# libyaml C bindings when available (much faster than the pure-Python emitter)
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper
+
 
 # ClickHouse Configuration
 CLICKHOUSE_URL = "http://ec2-47-129-241-41.ap-southeast-1.compute.amazonaws.com:8123"
@@ -19,15 +26,17 @@ CLICKHOUSE_DB = "metrics"
 CLICKHOUSE_TABLE = "ai_service_features_hourly"
 
 
-def fetch_distinct_services(application_id: int) -> List[Dict[str, Any]]:
+def iter_services(application_id: int) -> Iterator[Dict[str, Any]]:
     """
-    Fetch all distinct services and their IDs for a given application from ClickHouse
+    Stream all distinct services and their IDs for a given application from ClickHouse
+
+    Rows are decoded one JSONEachRow line at a time, so no intermediate list is built.
 
     Args:
         application_id: Application ID to fetch services for
 
-    Returns:
-        List of dictionaries with service and service_id
+    Yields:
+        Dictionaries with service, service_id and application_id
     """
 
     query = f"""
@@ -46,19 +55,20 @@ def fetch_distinct_services(application_id: int) -> List[Dict[str, Any]]:
             CLICKHOUSE_URL,
             auth=(CLICKHOUSE_USER, CLICKHOUSE_PASSWORD),
             params={"query": query.strip()},
-            timeout=30
+            timeout=30,
+            stream=True
         )
         response.raise_for_status()
 
-        # Parse JSONEachRow format
-        services = [
-            json.loads(line)
-            for line in response.text.strip().split("\n")
-            if line.strip()
-        ]
+        # Parse JSONEachRow format line by line
+        count = 0
+        with response:
+            for line in response.iter_lines():
+                if line.strip():
+                    count += 1
+                    yield orjson.loads(line)
 
-        print(f"✓ Fetched {len(services)} distinct services for application_id={application_id}")
-        return services
+        print(f"✓ Fetched {count} distinct services for application_id={application_id}")
 
     except requests.exceptions.Timeout as e:
         print(f"✗ ClickHouse timeout after 30s: {e}")
@@ -77,6 +87,50 @@ def fetch_distinct_services(application_id: int) -> List[Dict[str, Any]]:
         raise
 
 
+def fetch_distinct_services(application_id: int) -> List[Dict[str, Any]]:
+    """
+    Fetch all distinct services and their IDs for a given application from ClickHouse
+
+    Args:
+        application_id: Application ID to fetch services for
+
+    Returns:
+        List of dictionaries with service and service_id
+    """
+    return list(iter_services(application_id))
+
+
+@functools.lru_cache(maxsize=1024)
+def _strip_url_prefix(url: str) -> str:
+    """
+    Strip scheme, host and the /services/ prefix from a URL (method already removed)
+
+    Memoized: the same URL recurs under different HTTP methods (GET/POST/PUT ...).
+
+    Args:
+        url: Service URL without the HTTP method
+
+    Returns:
+        Cleaned service path
+    """
+    # Extract path after domain
+    if "://" in url:
+        # Split by :// and take everything after domain:port
+        after_protocol = url.split("://", 1)[1]
+        if "/" in after_protocol:
+            path = after_protocol.split("/", 1)[1]
+        else:
+            path = after_protocol
+    else:
+        path = url
+
+    # Remove /services/ prefix if exists
+    if path.startswith("services/"):
+        path = path[9:]  # len("services/") = 9
+
+    return path
+
+
 def extract_service_name(service_url: str) -> str:
     """
     Extract a clean service name from the full service URL
@@ -99,34 +153,19 @@ def extract_service_name(service_url: str) -> str:
         else:
             url = service_url
 
-        # Extract path after domain
-        if "://" in url:
-            # Split by :// and take everything after domain:port
-            after_protocol = url.split("://", 1)[1]
-            if "/" in after_protocol:
-                path = after_protocol.split("/", 1)[1]
-            else:
-                path = after_protocol
-        else:
-            path = url
-
-        # Remove /services/ prefix if exists
-        if path.startswith("services/"):
-            path = path[9:]  # len("services/") = 9
-
-        return path
+        return _strip_url_prefix(url)
 
     except Exception:
         # If parsing fails, return original
         return service_url
 
 
-def create_service_mapping(services: List[Dict[str, Any]], include_clean_names: bool = True) -> Dict[str, Any]:
+def create_service_mapping(services: Iterable[Dict[str, Any]], include_clean_names: bool = True) -> Dict[str, Any]:
     """
     Create a structured service mapping from raw service data
 
     Args:
-        services: List of service dictionaries from ClickHouse
+        services: Iterable of service dictionaries from ClickHouse (e.g. iter_services())
         include_clean_names: Whether to include cleaned service names
 
     Returns:
@@ -136,13 +175,18 @@ def create_service_mapping(services: List[Dict[str, Any]], include_clean_names:
     # Create mapping by service_id
     services_by_id = {}
 
-    # Track application_id
-    app_id = services[0]['application_id'] if services else None
+    # Track application_id (taken from the first row)
+    app_id = None
+    total_services = 0
 
     for svc in services:
         service_id = svc['service_id']
         service_name = svc['service']
 
+        if app_id is None:
+            app_id = svc['application_id']
+        total_services += 1
+
         service_entry = {
             'service_id': service_id,
             'service_name': service_name,
@@ -150,14 +194,13 @@ def create_service_mapping(services: List[Dict[str, Any]], include_clean_names:
 
         # Add cleaned name if requested
         if include_clean_names:
-            clean_name = extract_service_name(service_name)
-            service_entry['service_path'] = clean_name
+            service_entry['service_path'] = extract_service_name(service_name)
 
         services_by_id[service_id] = service_entry
 
     return {
         'application_id': app_id,
-        'total_services': len(services),
+        'total_services': total_services,
         'services_by_id': services_by_id,
         'metadata': {
             'source': 'ClickHouse',
@@ -183,7 +226,7 @@ def save_to_yaml(data: Dict[str, Any], output_file: str = "services.yaml") -> No
 
     try:
         with open(output_file, 'w') as f:
-            yaml.dump(data, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+            yaml.dump(data, f, Dumper=SafeDumper, default_flow_style=False, sort_keys=False, allow_unicode=True)
 
         print(f"✓ Saved service mapping to {output_file}")
         print(f"  Total services: {data['total_services']}")
@@ -226,18 +269,15 @@ def main():
     print(f"Output file: {args.output}")
     print()
 
-    # Fetch services
-    print("Fetching services from ClickHouse...")
-    services = fetch_distinct_services(args.app_id)
+    # Fetch services and build mapping in a single streaming pass
+    print("Fetching services from ClickHouse and creating service mapping...")
+    services = iter_services(args.app_id)
+    mapping = create_service_mapping(services, include_clean_names=not args.no_clean_names)
 
-    if not services:
+    if not mapping['services_by_id']:
         print("⚠ No services found for this application ID")
         return
 
-    # Create mapping
-    print("\nCreating service mapping...")
-    mapping = create_service_mapping(services, include_clean_names=not args.no_clean_names)
-
     # Save to YAML
     print("\nSaving to YAML...")
     save_to_yaml(mapping, args.output)
@@ -6,67 +6,353 @@ Uses AWS Bedrock Claude Sonnet 4.5 to classify user queries into intents and det
 
 import os
 import json
+import asyncio
+import logging
+import functools
+import pickle
+import re
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import yaml
-from typing import Dict, List, Set, Any
+from datetime import datetime, timezone
+from typing import Dict, List, Set, Any, Optional, Tuple
 from dotenv import load_dotenv
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from timestamp import TimestampResolver
 
+# orjson for Bedrock request/response bodies when available (stdlib json otherwise)
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+# Environment is read once at import, not on every IntentClassifier() construction
+load_dotenv()
+
+_AWS_REGION = os.getenv('AWS_REGION', 'us-east-1')
+_AWS_ACCESS_KEY_ID = os.getenv('AWS_ACCESS_KEY_ID')
+_AWS_SECRET_ACCESS_KEY = os.getenv('AWS_SECRET_ACCESS_KEY')
+_MODEL_ID = os.getenv('BEDROCK_MODEL_ID', 'global.anthropic.claude-sonnet-4-5-20250929-v1:0')
+_MAX_TOKENS = int(os.getenv('MAX_TOKENS', '500'))
+_TEMPERATURE = float(os.getenv('TEMPERATURE', '0.0'))
+# Bedrock performance mode: 'standard', or opt in to 'optimized' (latency-optimized
+# inference, only offered for some models/regions - others reject it with a ValidationException)
+_LATENCY_MODE = os.getenv('BEDROCK_LATENCY', 'standard')
+_WARMUP = os.getenv('BEDROCK_WARMUP', '1') != '0'
+# Answer unambiguous keyword queries locally instead of calling Bedrock
+_KEYWORD_FAST_PATH = os.getenv('INTENT_KEYWORD_FAST_PATH', '1') != '0'
+
+# Parses the first JSON value in the LLM text and stops, ignoring any trailing prose
+_JSON_DECODER = json.JSONDecoder()
+
+# libyaml C bindings when available (much faster than the pure-Python loader)
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Maximum number of distinct (query, day) LLM classifications kept in memory
+CLASSIFY_CACHE_SIZE = 1024
+
+# Maximum number of distinct (primary, secondary intents) closures kept in memory
+INTENT_CLOSURE_CACHE_SIZE = 2048
+
+# Number of queries packed into one Bedrock request by classify_many()
+CLASSIFY_BATCH_SIZE = 5
+
+# Keep TLS connections to Bedrock alive and pooled between invocations
+BEDROCK_CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=32,
+    retries={'max_attempts': 2, 'mode': 'adaptive'}
+)
+
+
+# Time phrases the keyword fast path can resolve without the LLM; a query must contain
+# exactly one of them (any other time wording goes to the LLM)
+_DYNAMIC_TIME_RE = re.compile(r'\b(?:past|last)\s+(\d+)\s+(hour|day|week|month)s?\b')
+_STATIC_TIME_PHRASES = (
+    ('last hour', 'last_hour'),
+    ('today', 'today'),
+    ('yesterday', 'yesterday'),
+    ('this week', 'this_week'),
+    ('last week', 'last_week'),
+    ('last month', 'last_month'),
+    ('right now', 'current'),
+    ('currently', 'current'),
+    ('current', 'current'),
+    ('now', 'current'),
+)
+_STATIC_TIME_RE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(phrase) for phrase, _ in _STATIC_TIME_PHRASES) + r')\b'
+)
+_STATIC_TIME_RANGES = dict(_STATIC_TIME_PHRASES)
+
+# Time wording left over after removing the recognized phrase (minutes, dates, weekdays,
+# "since"/"in March"...) means the fast path would resolve the wrong window
+_OTHER_TIME_RE = re.compile(
+    r'\d|\b(?:since|until|till|ago|between|from|before|after|earlier|recent(?:ly)?'
+    r'|seconds?|minutes?|hours?|days?|weeks?|months?|quarters?|years?'
+    r'|tonight|morning|afternoon|evening|overnight|weekend|tomorrow|next|last|past|this'
+    r'|jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?'
+    r'|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?'
+    r'|mon(?:day)?|tue(?:s(?:day)?)?|wed(?:nesday)?|thu(?:rs(?:day)?)?|fri(?:day)?'
+    r'|sat(?:urday)?|sun(?:day)?)\b'
+)
+
+# Queries the keyword matcher must leave to the LLM: comparisons and likely service names
+_FAST_PATH_EXCLUDE_RE = re.compile(r'\bvs\b|versus|compar|\bservice\b|\w[-_./]\w')
+
+# "for/of/on <word>" names a target (service, team...) the fast path can't extract,
+# unless the word is generic or part of the time phrase
+_TARGET_RE = re.compile(r'\b(?:for|of|on)\s+(?:the\s+)?([a-z]\w*)')
+_GENERIC_TARGET_WORDS = frozenset({
+    'a', 'an', 'all', 'any', 'every', 'everything', 'my', 'our', 'us', 'me', 'it', 'this', 'that',
+    'today', 'yesterday', 'now', 'current', 'last', 'past', 'week', 'month', 'hour', 'day',
+})
+
+
+_PROMPT_HEADER = """You classify questions for an SRE reliability platform. Return ONLY JSON.
+
+RULES:
+- primary_intent: exactly one intent from the list below; if unsure, the closest high-level one
+- secondary_intents: related intents only if clearly implied
+- entities.service: service name if mentioned, else null (never guess apps, tenants or IDs)
+- entities.time_range: current|today|yesterday|last_hour|this_week|last_week|last_month,
+  or past_N_hours|past_N_days|past_N_weeks|past_N_months ("last 5 hours" -> past_5_hours);
+  "recently" -> last_hour; not mentioned -> current
+- entities.comparison_range: comparison period ("vs yesterday") if mentioned, else null
+
+INTENTS:
+
+"""
+
+_PROMPT_FOOTER = """OUTPUT:
+{"primary_intent": "...", "secondary_intents": [], "entities": {"service": null, "time_range": "current", "comparison_range": null}}
+"""
+
+_BATCH_PROMPT_SUFFIX = """
+BATCH MODE:
+The user message is a JSON array of questions: [{"id": 0, "query": "..."}, ...]
+Classify EACH question independently using the rules and schema above.
+Return ONLY a JSON array with one object per question, echoing its id:
+[{"id": 0, "primary_intent": "...", "secondary_intents": [], "entities": {...}}, ...]
+"""
+
+
+def _intent_prompt_key(intent_categories: Dict) -> Tuple[Tuple[str, Tuple[Tuple[str, str], ...]], ...]:
+    """Hashable (category, ((intent, description), ...)) key for build_system_prompt"""
+    return tuple(
+        (
+            category,
+            tuple(
+                (intent_name, intent_data.get('description', ''))
+                for intent_name, intent_data in category_data['intents'].items()
+            )
+        )
+        for category, category_data in intent_categories.items()
+        if 'intents' in category_data
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def build_system_prompt(intent_key: Tuple[Tuple[str, Tuple[Tuple[str, str], ...]], ...]) -> str:
+    """
+    Build the system prompt for intent classification
+
+    Cached on the intent list, so every IntentClassifier built from the same YAML
+    shares one prompt string.
+
+    Args:
+        intent_key: Output of _intent_prompt_key(intent_categories)
+
+    Returns:
+        System prompt text
+    """
+    parts = [_PROMPT_HEADER]
+
+    # Add all categories and their intents
+    for category, intents in intent_key:
+        parts.append(f"{category}:\n")
+        for intent_name, description in intents:
+            parts.append(f"- {intent_name}: {description}\n")
+        parts.append("\n")
+
+    parts.append(_PROMPT_FOOTER)
+    return ''.join(parts)
+
+
+def _run_coroutine(coro: Any) -> Any:
+    """
+    Run a coroutine to completion from synchronous code
+
+    asyncio.run raises inside a running event loop (notebooks, async servers), so there
+    the coroutine runs on its own loop in a worker thread instead; the caller blocks
+    either way, as with any synchronous call.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
 
 class IntentClassifier:
     """Main intent classifier class"""
 
     def __init__(self):
         """Initialize the intent classifier"""
-        # Load environment variables
-        load_dotenv()
-
         # Load YAML configurations
         self.intent_categories = self._load_yaml('intent_categories.yaml')
-        self.enrichment_rules = self._load_yaml('enrichment_rules.yaml')
+        # Frozen at load time; unknown intents map to an empty enrichment set
+        self.enrichment_rules = defaultdict(frozenset, {
+            intent: frozenset(enrichments)
+            for intent, enrichments in self._load_yaml('enrichment_rules.yaml').items()
+        })
         self.data_sources_config = self._load_yaml('data_sources.yaml')
 
         # Build intent to data sources mapping
         self.intent_to_data_sources = self._build_intent_data_source_map()
 
+        # Data sources of each intent together with its enrichment intents
+        self._intent_to_ds_closure = self._build_data_source_closure()
+
+        # Keyword -> intent matcher for the no-LLM fast path
+        self._keyword_to_intent, self._keyword_re = self._build_keyword_matcher()
+
         # Initialize timestamp resolver
         self.timestamp_resolver = TimestampResolver()
 
         # Initialize AWS Bedrock client
         self.bedrock_runtime = boto3.client(
             service_name='bedrock-runtime',
-            region_name=os.getenv('AWS_REGION', 'us-east-1'),
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY')
+            region_name=_AWS_REGION,
+            aws_access_key_id=_AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=_AWS_SECRET_ACCESS_KEY,
+            config=BEDROCK_CLIENT_CONFIG
         )
 
+        # Async session for concurrent classification (aclassify / classify_batch), created
+        # on first use so the synchronous classifier works without aioboto3 installed
+        self._bedrock_session = None
+        self._bedrock_session_lock = threading.Lock()
+
         # Model configuration
-        self.model_id = os.getenv('BEDROCK_MODEL_ID', 'global.anthropic.claude-sonnet-4-5-20250929-v1:0')
-        self.max_tokens = int(os.getenv('MAX_TOKENS', '500'))
-        self.temperature = float(os.getenv('TEMPERATURE', '0.0'))
+        self.model_id = _MODEL_ID
+        self.max_tokens = _MAX_TOKENS
+        self.temperature = _TEMPERATURE
+        self.latency_mode = _LATENCY_MODE
+        # performanceConfigLatency is only sent when the operator opted in
+        self._invoke_options = (
+            {'performanceConfigLatency': 'optimized'} if self.latency_mode == 'optimized' else {}
+        )
 
-        # Build system prompt
+        # Build system prompts (single query and packed multi-query variants)
         self.system_prompt = self._build_system_prompt()
+        self.batch_system_prompt = self.system_prompt + _BATCH_PROMPT_SUFFIX
+
+        # Per-instance LRU cache of serialized LLM results keyed on (normalized query, UTC day);
+        # Bedrock itself always sees the original query so entities keep their casing
+        self._llm_cache: 'OrderedDict[Tuple[str, str], bytes]' = OrderedDict()
+        self._llm_cache_lock = threading.Lock()
+
+        # Enrichment rules and data source mappings are static, so intent closures are memoized
+        self._cached_intent_closure = functools.lru_cache(maxsize=INTENT_CLOSURE_CACHE_SIZE)(
+            self._intent_closure
+        )
+
+        # Prime the connection pool in the background (set BEDROCK_WARMUP=0 to disable)
+        if _WARMUP:
+            threading.Thread(target=self._warmup, daemon=True).start()
+
+    @property
+    def bedrock_session(self) -> Any:
+        """aioboto3 session for the async classify variants (imported on first use)"""
+        if self._bedrock_session is None:
+            with self._bedrock_session_lock:
+                if self._bedrock_session is None:
+                    import aioboto3
+                    self._bedrock_session = aioboto3.Session(
+                        region_name=_AWS_REGION,
+                        aws_access_key_id=_AWS_ACCESS_KEY_ID,
+                        aws_secret_access_key=_AWS_SECRET_ACCESS_KEY
+                    )
+        return self._bedrock_session
+
+    def _warmup(self):
+        """Issue a 1-token request so the TLS handshake and SigV4 setup happen before the first classify()"""
+        try:
+            self.bedrock_runtime.invoke_model(
+                modelId=self.model_id,
+                body=_dumps({
+                    "anthropic_version": "bedrock-2023-05-31",
+                    "max_tokens": 1,
+                    "messages": [{"role": "user", "content": "ping"}]
+                }),
+                **self._invoke_options
+            )
+        except Exception:
+            # Best effort only; the first real call will simply pay the cold-start cost
+            pass
 
     def _load_yaml(self, filename: str) -> Dict:
-        """Load YAML file"""
+        """Load YAML file (served from a pickle cache while the YAML is unchanged)"""
         try:
             # Get the directory where this script is located
             script_dir = os.path.dirname(os.path.abspath(__file__))
             # Build the full path to the YAML file
             file_path = os.path.join(script_dir, filename)
+            cache_path = file_path + '.pkl'
+
+            # Use the pickle cache if it is at least as new as the YAML file
+            yaml_mtime = os.path.getmtime(file_path)
+            if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= yaml_mtime:
+                try:
+                    with open(cache_path, 'rb') as f:
+                        return pickle.load(f)
+                except Exception as e:
+                    # Corrupt, truncated or written by an incompatible version - re-parse below
+                    logger.warning("Ignoring unreadable snapshot %s: %s", cache_path, e)
 
             with open(file_path, 'r') as f:
-                return yaml.safe_load(f)
+                data = yaml.load(f, Loader=SafeLoader)
+
+            try:
+                with open(cache_path, 'wb') as f:
+                    pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            except OSError:
+                pass  # Read-only install - just skip caching
+
+            return data
         except FileNotFoundError:
-            print(f"Error: {filename} not found")
+            logger.error("%s not found", filename)
             return {}
         except yaml.YAMLError as e:
-            print(f"Error parsing {filename}: {e}")
+            logger.error("Error parsing %s: %s", filename, e)
             return {}
 
-    def _build_intent_data_source_map(self) -> Dict[str, List[str]]:
+    def _build_intent_data_source_map(self) -> Dict[str, frozenset]:
         """Build mapping from intent to data sources"""
         intent_map = {}
 
@@ -74,164 +360,443 @@ class IntentClassifier:
             if 'intents' in category_data:
                 for intent_name, intent_data in category_data['intents'].items():
                     if 'data_sources' in intent_data:
-                        intent_map[intent_name] = intent_data['data_sources']
+                        intent_map[intent_name] = frozenset(intent_data['data_sources'])
 
         return intent_map
 
-    def _build_system_prompt(self) -> str:
-        """Build the system prompt for intent classification"""
-        prompt = """You are an intent classification engine for an AI-driven SRE reliability platform.
-
-Your ONLY job is to:
-1. Identify the PRIMARY intent of the user question.
-2. Identify any SECONDARY intents if clearly implied.
-3. Extract ENTITIES such as:
-   - service name (if mentioned)
-   - time range (explicit or implicit)
-   - comparison period if present ("vs yesterday", "vs last month")
-
-TIME RANGE EXTRACTION RULES:
-- For static ranges: Use "today", "yesterday", "last_hour", "this_week", "last_week", "last_month"
-- For dynamic ranges: Extract as "past_N_days", "past_N_hours", "past_N_weeks", "past_N_months"
-  Examples:
-  * "past 10 days" → "past_10_days"
-  * "last 5 hours" → "past_5_hours"
-  * "past 2 weeks" → "past_2_weeks"
-  * "past 3 months" → "past_3_months"
-- If time range not mentioned, default to "current"
-- "recently" → "last_hour"
-
-You MUST follow these rules strictly:
+    def _build_data_source_closure(self) -> Dict[str, frozenset]:
+        """
+        Build mapping from intent to the data sources of the intent plus its enrichments
 
-RULES:
-- Return ONLY valid JSON. No explanation text.
-- Do NOT guess application, tenant, or IDs.
-- If service is unclear, set service = null.
-- If time range not mentioned, default to "current".
-- Use ONLY intents from the allowed list.
-- Be conservative. If unsure, choose the closest high-level intent.
+        Enrichment is one level deep (same as _get_enrichment_intents), so the data
+        sources of a query's enriched intents are the union of these sets over its
+        primary + secondary intents.
+        """
+        closure = {}
+        empty = frozenset()
 
-ALLOWED PRIMARY INTENTS:
+        for intent in set(self.intent_to_data_sources) | set(self.enrichment_rules):
+            closure[intent] = self.intent_to_data_sources.get(intent, empty).union(
+                *(self.intent_to_data_sources.get(enrichment, empty)
+                  for enrichment in self.enrichment_rules[intent])
+            )
 
-"""
+        return closure
 
-        # Add all categories and their intents
-        for category, category_data in self.intent_categories.items():
-            if 'intents' in category_data:
-                prompt += f"{category}:\n"
-                for intent_name, intent_data in category_data['intents'].items():
-                    prompt += f"- {intent_name}: {intent_data.get('description', '')}\n"
-                prompt += "\n"
-
-        prompt += """OUTPUT JSON SCHEMA:
-
-{
-  "primary_intent": "<ONE_ALLOWED_INTENT>",
-  "secondary_intents": [],
-  "entities": {
-    "service": null,
-    "time_range": "current",
-    "comparison_range": null
-  }
-}
-
-IMPORTANT:
-- primary_intent: Must be a single intent from the allowed list
-- secondary_intents: Array of related intents that should be auto-included (from enrichment rules)
-- entities.service: Service name if mentioned, otherwise null
-- entities.time_range: Time range examples:
-  * Static: "current", "today", "yesterday", "last_hour", "this_week", "last_week", "last_month"
-  * Dynamic: "past_10_days", "past_5_hours", "past_2_weeks", "past_3_months"
-- entities.comparison_range: Comparison period if mentioned, otherwise null
-
-NOTE: Do NOT include data_sources in your response. Data sources will be determined automatically based on the intents.
-
-Return ONLY the JSON object. No additional text.
-"""
+    def _build_keyword_matcher(self) -> Tuple[Dict[str, str], Optional[re.Pattern]]:
+        """
+        Compile the optional per-intent `keywords` from intent_categories.yaml into one regex
 
-        return prompt
+        Longer keywords come first in the alternation so they win over their prefixes.
 
-    def _call_bedrock(self, user_query: str) -> Dict[str, Any]:
-        """Call AWS Bedrock to classify intent and extract entities"""
-        try:
-            # Prepare the request body for Claude Sonnet 4.5
-            request_body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": self.max_tokens,
-                "temperature": self.temperature,
-                "system": self.system_prompt,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": user_query
-                    }
-                ]
+        Returns:
+            (keyword -> intent mapping, compiled pattern or None when no keywords are defined)
+        """
+        keyword_to_intent = {}
+        for category_data in self.intent_categories.values():
+            for intent_name, intent_data in category_data.get('intents', {}).items():
+                for keyword in intent_data.get('keywords', []):
+                    keyword_to_intent[keyword.lower()] = intent_name
+
+        if not keyword_to_intent:
+            return keyword_to_intent, None
+
+        alternation = '|'.join(re.escape(k) for k in sorted(keyword_to_intent, key=len, reverse=True))
+        return keyword_to_intent, re.compile(rf'\b(?:{alternation})\b')
+
+    def _match_keywords(self, user_query: str) -> Optional[Dict[str, Any]]:
+        """
+        Classify a query from keywords alone when the answer is unambiguous
+
+        Args:
+            user_query: The user's question
+
+        Returns:
+            LLM-shaped classification, or None to fall back to Bedrock
+        """
+        if not _KEYWORD_FAST_PATH or self._keyword_re is None:
+            return None
+
+        query = user_query.lower()
+        if _FAST_PATH_EXCLUDE_RE.search(query):
+            return None
+
+        intents = {self._keyword_to_intent[m] for m in self._keyword_re.findall(query)}
+        if len(intents) != 1:
+            return None
+
+        # A named target ("error budget for payments") needs the LLM's entity extraction
+        if any(word not in _GENERIC_TARGET_WORDS for word in _TARGET_RE.findall(query)):
+            return None
+
+        # Only skip Bedrock when time extraction succeeds: exactly one recognized phrase
+        # and no other time wording ("last 30 minutes", "since Monday", "in March")
+        match = _DYNAMIC_TIME_RE.search(query) or _STATIC_TIME_RE.search(query)
+        if match is None:
+            return None
+        remainder = query[:match.start()] + ' ' + query[match.end():]
+        if _OTHER_TIME_RE.search(remainder):
+            return None
+
+        if match.re is _DYNAMIC_TIME_RE:
+            time_range = f"past_{match.group(1)}_{match.group(2)}s"
+        else:
+            time_range = _STATIC_TIME_RANGES[match.group(0)]
+
+        return {
+            "primary_intent": intents.pop(),
+            "secondary_intents": [],
+            "entities": {
+                "service": None,
+                "time_range": time_range,
+                "comparison_range": None
             }
+        }
 
-            # Invoke the model
-            response = self.bedrock_runtime.invoke_model(
-                modelId=self.model_id,
-                body=json.dumps(request_body)
-            )
+    def _build_system_prompt(self) -> str:
+        """Build the system prompt for intent classification (shared across instances)"""
+        return build_system_prompt(_intent_prompt_key(self.intent_categories))
+
+    def _build_request_body(
+        self,
+        user_query: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: Optional[int] = None
+    ) -> bytes:
+        """Build the serialized Bedrock request body for Claude Sonnet 4.5"""
+        request_body = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": max_tokens or self.max_tokens,
+            "temperature": self.temperature,
+            # Static system prompt is marked cacheable so repeat calls skip its prefill
+            "system": [
+                {
+                    "type": "text",
+                    "text": system_prompt or self.system_prompt,
+                    "cache_control": {"type": "ephemeral"}
+                }
+            ],
+            "messages": [
+                {
+                    "role": "user",
+                    "content": user_query
+                }
+            ]
+        }
+        return _dumps(request_body)
+
+    def _parse_response_body(self, raw_body: bytes, open_char: str = '{') -> Any:
+        """
+        Extract the classification JSON from a raw Bedrock response body
 
-            # Parse the response
-            response_body = json.loads(response['body'].read())
+        Args:
+            raw_body: Raw response body bytes
+            open_char: '{' for a single object, '[' for a batch array
+
+        Returns:
+            Parsed JSON value, or {} on parse failure
+        """
+        assistant_message = ""
+        try:
+            response_body = _loads(raw_body)
             assistant_message = response_body['content'][0]['text']
 
             # Extract JSON object from response
             # Handle cases where LLM might add extra text
             assistant_message = assistant_message.strip()
 
-            # Find JSON object in the response
-            start_idx = assistant_message.find('{')
-            end_idx = assistant_message.rfind('}') + 1
+            # Decode the JSON value starting at the first opening bracket in one pass
+            start_idx = assistant_message.find(open_char)
 
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = assistant_message[start_idx:end_idx]
-                result = json.loads(json_str)
+            if start_idx != -1:
+                result, _ = _JSON_DECODER.raw_decode(assistant_message, start_idx)
                 return result
             else:
                 # Fallback: try to parse the entire response
-                return json.loads(assistant_message)
+                return _loads(assistant_message)
 
-        except ClientError as e:
-            print(f"AWS Bedrock Error: {e}")
+        except json.JSONDecodeError as e:
+            logger.error("JSON Parsing Error: %s", e)
+            logger.debug("LLM Response: %s", assistant_message)
             return {}
+
+    @staticmethod
+    def _read_streamed_json(event_stream: Any) -> str:
+        """
+        Accumulate streamed text deltas until the first top-level JSON object closes
+
+        Braces inside JSON strings are ignored. Returns as soon as the object is
+        complete so the rest of the stream (trailing prose) is never waited on.
+
+        Args:
+            event_stream: Bedrock response stream (iterable of {'chunk': {'bytes': ...}} events)
+
+        Returns:
+            Accumulated assistant text (ending at the closing brace when one was seen)
+        """
+        parts = []
+        depth = 0
+        in_string = False
+        escaped = False
+
+        for event in event_stream:
+            chunk = event.get('chunk')
+            if not chunk:
+                continue
+            payload = _loads(chunk['bytes'])
+            if payload.get('type') != 'content_block_delta':
+                continue
+
+            text = payload['delta'].get('text', '')
+            for i, ch in enumerate(text):
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif ch == '\\':
+                        escaped = True
+                    elif ch == '"':
+                        in_string = False
+                elif ch == '"' and depth:
+                    in_string = True
+                elif ch == '{':
+                    depth += 1
+                elif ch == '}' and depth:
+                    depth -= 1
+                    if depth == 0:
+                        parts.append(text[:i + 1])
+                        return ''.join(parts)
+            parts.append(text)
+
+        return ''.join(parts)
+
+    def _call_bedrock(self, user_query: str) -> Dict[str, Any]:
+        """Call AWS Bedrock to classify intent and extract entities (streamed)"""
+        assistant_message = ""
+        try:
+            # Stream the response so parsing can start as soon as the JSON object closes
+            response = self.bedrock_runtime.invoke_model_with_response_stream(
+                modelId=self.model_id,
+                body=self._build_request_body(user_query),
+                **self._invoke_options
+            )
+            event_stream = response['body']
+            try:
+                assistant_message = self._read_streamed_json(event_stream)
+            finally:
+                # Stop receiving once the object is complete
+                close = getattr(event_stream, 'close', None)
+                if close:
+                    close()
+
+            start_idx = assistant_message.find('{')
+            if start_idx == -1:
+                return _loads(assistant_message)
+            result, _ = _JSON_DECODER.raw_decode(assistant_message, start_idx)
+            return result
+
         except json.JSONDecodeError as e:
-            print(f"JSON Parsing Error: {e}")
-            print(f"LLM Response: {assistant_message}")
+            logger.error("JSON Parsing Error: %s", e)
+            logger.debug("LLM Response: %s", assistant_message)
+            return {}
+
+        except ClientError as e:
+            logger.error("AWS Bedrock Error: %s", e)
+            return {}
+        except Exception as e:
+            logger.exception("Unexpected error: %s", e)
+            return {}
+
+    async def _acall_bedrock_batch(self, client: Any, user_queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Classify several queries with ONE Bedrock request (packed JSON array)
+
+        Args:
+            client: Open aioboto3 bedrock-runtime client
+            user_queries: Queries to classify (at most CLASSIFY_BATCH_SIZE)
+
+        Returns:
+            Raw LLM classifications aligned with user_queries ({} where missing)
+        """
+        packed = json.dumps([{"id": i, "query": query} for i, query in enumerate(user_queries)])
+
+        try:
+            response = await client.invoke_model(
+                modelId=self.model_id,
+                body=self._build_request_body(
+                    packed,
+                    system_prompt=self.batch_system_prompt,
+                    max_tokens=self.max_tokens * len(user_queries)
+                ),
+                **self._invoke_options
+            )
+            items = self._parse_response_body(await response['body'].read(), '[')
+
+        except ClientError as e:
+            logger.error("AWS Bedrock Error: %s", e)
+            items = []
+        except Exception as e:
+            logger.exception("Unexpected error: %s", e)
+            items = []
+
+        # Map ids back to query positions
+        by_id = {}
+        if isinstance(items, list):
+            for item in items:
+                if isinstance(item, dict) and isinstance(item.get('id'), int):
+                    by_id[item['id']] = item
+
+        return [by_id.get(i, {}) for i in range(len(user_queries))]
+
+    @staticmethod
+    def _llm_cache_key(user_query: str) -> Tuple[str, str]:
+        """LLM cache key: normalized query and UTC day (relative time entities age daily)"""
+        return user_query.strip().lower(), datetime.now(timezone.utc).date().isoformat()
+
+    def _llm_cache_get(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached LLM classification
+
+        Args:
+            key: Key from _llm_cache_key()
+
+        Returns:
+            Raw LLM classification (a private copy), or None on a miss
+        """
+        with self._llm_cache_lock:
+            llm_blob = self._llm_cache.get(key)
+            if llm_blob is not None:
+                self._llm_cache.move_to_end(key)
+
+        # Callers may mutate the result (e.g. entities), so decode a fresh copy per call
+        return _loads(llm_blob) if llm_blob is not None else None
+
+    def _llm_cache_put(self, key: Tuple[str, str], llm_result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Cache a successful LLM classification (failures are not cached)
+
+        Args:
+            key: Key from _llm_cache_key()
+            llm_result: Raw LLM classification
+
+        Returns:
+            llm_result, or {} if it is not a usable classification
+        """
+        if not llm_result or 'primary_intent' not in llm_result:
+            return {}
+
+        # Cached serialized, so every hit decodes a fresh private copy
+        # (much cheaper than deep-copying a cached dict)
+        llm_blob = _dumps(llm_result)
+        with self._llm_cache_lock:
+            self._llm_cache[key] = llm_blob
+            if len(self._llm_cache) > CLASSIFY_CACHE_SIZE:
+                self._llm_cache.popitem(last=False)
+        return llm_result
+
+    def _classify_llm(self, user_query: str) -> Dict[str, Any]:
+        """
+        Get the LLM intent/entity extraction for a query, served from cache on repeats
+
+        Only the LLM output is cached; timestamps are still resolved fresh per call.
+
+        Args:
+            user_query: The user's question
+
+        Returns:
+            Raw LLM classification (a private copy), or {} on failure
+        """
+        key = self._llm_cache_key(user_query)
+        cached = self._llm_cache_get(key)
+        if cached is not None:
+            return cached
+
+        # Original query (not the normalized key) so e.g. "PaymentAPI" keeps its casing
+        return self._llm_cache_put(key, self._call_bedrock(user_query))
+
+    def clear_cache(self):
+        """Drop all cached LLM classifications"""
+        with self._llm_cache_lock:
+            self._llm_cache.clear()
+
+    async def _acall_bedrock(self, client: Any, user_query: str) -> Dict[str, Any]:
+        """Async variant of _call_bedrock using an open aioboto3 bedrock-runtime client"""
+        try:
+            response = await client.invoke_model(
+                modelId=self.model_id,
+                body=self._build_request_body(user_query),
+                **self._invoke_options
+            )
+
+            return self._parse_response_body(await response['body'].read())
+
+        except ClientError as e:
+            logger.error("AWS Bedrock Error: %s", e)
             return {}
         except Exception as e:
-            print(f"Unexpected error: {e}")
+            logger.exception("Unexpected error: %s", e)
             return {}
 
     def _get_enrichment_intents(self, primary_intents: List[str]) -> Set[str]:
         """Get all enrichment intents for the primary intents"""
-        enriched_intents = set(primary_intents)
+        return set(primary_intents).union(*(self.enrichment_rules[intent] for intent in primary_intents))
+
+    def _get_data_sources(self, intents: List[str]) -> List[str]:
+        """Get all required data sources for the intents and their enrichment intents"""
+        empty = frozenset()
+        return sorted(empty.union(*(self._intent_to_ds_closure.get(intent, empty) for intent in intents)))
+
+    def _intent_closure(
+        self,
+        primary_intent: Optional[str],
+        secondary_intents: Tuple[str, ...]
+    ) -> Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]:
+        """
+        Resolve everything derived from an intent combination (memoized per instance)
+
+        Args:
+            primary_intent: Primary intent or None
+            secondary_intents: Sorted, de-duplicated secondary intents
+
+        Returns:
+            (sorted enriched intents, sorted data sources, sorted enrichments of the primary intent)
+        """
+        all_intents = [primary_intent, *secondary_intents] if primary_intent else list(secondary_intents)
+
+        enriched_intents = tuple(sorted(self._get_enrichment_intents(all_intents)))
 
-        # Process each primary intent
-        for intent in primary_intents:
-            if intent in self.enrichment_rules:
-                # Add all enrichment intents
-                for enrichment in self.enrichment_rules[intent]:
-                    enriched_intents.add(enrichment)
+        # Get required data sources from intent definitions (NOT from LLM)
+        # This ensures proper mapping based on intent_categories.yaml
+        data_sources = tuple(self._get_data_sources(all_intents))
 
-        return enriched_intents
+        # .get() so lookups of unknown intents don't populate the defaultdict
+        primary_enrichments = tuple(sorted(self.enrichment_rules.get(primary_intent, ()))) if primary_intent else ()
 
-    def _get_data_sources(self, intents: Set[str]) -> List[str]:
-        """Get all required data sources for the intents"""
-        data_sources = set()
+        return enriched_intents, data_sources, primary_enrichments
 
-        for intent in intents:
-            if intent in self.intent_to_data_sources:
-                data_sources.update(self.intent_to_data_sources[intent])
+    def expand_intents(self, primary_intent: str, secondary_intents: Tuple[str, ...] = ()) -> Set[str]:
+        """
+        All intents a classification with these intents would route on (including enrichments)
 
-        return sorted(list(data_sources))
+        Args:
+            primary_intent: Primary intent
+            secondary_intents: Secondary intents
+
+        Returns:
+            Set of primary, secondary and enriched intents
+        """
+        enriched_intents, _, _ = self._cached_intent_closure(
+            primary_intent, tuple(sorted(set(secondary_intents)))
+        )
+        return {primary_intent, *secondary_intents, *enriched_intents}
 
     def classify(self, user_query: str) -> Dict[str, Any]:
         """
         Classify user query and return intent, secondary intents, entities, and data sources
 
+        Makes at most one Bedrock round trip: the LLM returns intent and entities in a
+        single JSON response, while timestamps, enrichment and data sources are
+        resolved locally from it (keep it that way - no follow-up LLM calls here).
+
         Args:
             user_query: The user's question
 
@@ -244,9 +809,147 @@ Return ONLY the JSON object. No additional text.
             - enrichment_details: Details of which enrichments came from the primary intent
             - timestamp_resolution: Resolved UTC timestamps and index granularity
         """
-        # Get classification from LLM
-        llm_result = self._call_bedrock(user_query)
+        # Unambiguous keyword queries skip Bedrock; otherwise ask the LLM (cached per normalized query and day)
+        llm_result = self._match_keywords(user_query) or self._classify_llm(user_query)
+
+        return self.build_result(user_query, llm_result)
+
+    async def aclassify(
+        self,
+        user_query: str,
+        client: Optional[Any] = None,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of classify() - awaits Bedrock without blocking the event loop
+
+        Args:
+            user_query: The user's question
+            client: Optional open aioboto3 bedrock-runtime client to reuse
+            now: Optional reference UTC time for timestamp resolution
+
+        Returns:
+            Same structure as classify()
+        """
+        # Same keyword fast path and LLM cache as classify()
+        key = self._llm_cache_key(user_query)
+        llm_result = self._match_keywords(user_query) or self._llm_cache_get(key)
+
+        if llm_result is None:
+            if client is None:
+                async with self.bedrock_session.client('bedrock-runtime') as client:
+                    llm_result = await self._acall_bedrock(client, user_query)
+            else:
+                llm_result = await self._acall_bedrock(client, user_query)
+            llm_result = self._llm_cache_put(key, llm_result)
+
+        return self.build_result(user_query, llm_result, now)
+
+    async def aclassify_batch(self, user_queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Classify several queries concurrently over a single Bedrock client
+
+        Args:
+            user_queries: List of user questions
+
+        Returns:
+            List of classification results, in the same order as user_queries
+        """
+        # One reference time for the whole batch so time ranges line up
+        now = datetime.now(timezone.utc)
+
+        async with self.bedrock_session.client('bedrock-runtime') as client:
+            return await asyncio.gather(
+                *[self.aclassify(query, client=client, now=now) for query in user_queries]
+            )
 
+    async def aclassify_many(self, user_queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Classify queries packed CLASSIFY_BATCH_SIZE per Bedrock request, requests sent concurrently
+
+        Args:
+            user_queries: List of user questions
+
+        Returns:
+            List of classification results, in the same order as user_queries
+        """
+        # Keyword fast path and LLM cache first; only the remaining queries go to Bedrock
+        keys = [self._llm_cache_key(query) for query in user_queries]
+        llm_results = [
+            self._match_keywords(query) or self._llm_cache_get(key)
+            for query, key in zip(user_queries, keys)
+        ]
+        misses = [i for i, llm_result in enumerate(llm_results) if llm_result is None]
+
+        if misses:
+            chunks = [
+                [user_queries[i] for i in misses[start:start + CLASSIFY_BATCH_SIZE]]
+                for start in range(0, len(misses), CLASSIFY_BATCH_SIZE)
+            ]
+
+            async with self.bedrock_session.client('bedrock-runtime') as client:
+                chunk_results = await asyncio.gather(
+                    *[self._acall_bedrock_batch(client, chunk) for chunk in chunks]
+                )
+
+            fetched = [llm_result for chunk_result in chunk_results for llm_result in chunk_result]
+            for i, llm_result in zip(misses, fetched):
+                llm_result.pop('id', None)  # Packing id, not part of the classification
+                llm_results[i] = self._llm_cache_put(keys[i], llm_result)
+
+        now = datetime.now(timezone.utc)
+        return [
+            self.build_result(query, llm_result, now)
+            for query, llm_result in zip(user_queries, llm_results)
+        ]
+
+    def classify_many(self, user_queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Classify queries with one Bedrock request per CLASSIFY_BATCH_SIZE queries
+
+        Cheaper than classify_batch() (shared system prompt and round-trip per chunk);
+        queries the model leaves out of its answer come back as error results.
+
+        Args:
+            user_queries: List of user questions
+
+        Returns:
+            List of classification results, in the same order as user_queries
+        """
+        return _run_coroutine(self.aclassify_many(user_queries))
+
+    def classify_batch(self, user_queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Classify several queries concurrently (wall time ~1 Bedrock round-trip)
+
+        Args:
+            user_queries: List of user questions
+
+        Returns:
+            List of classification results, in the same order as user_queries
+        """
+        return _run_coroutine(self.aclassify_batch(user_queries))
+
+    def build_result(
+        self,
+        user_query: str,
+        llm_result: Dict[str, Any],
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the classification result from raw LLM output (intent + entities)
+
+        Public so callers holding a previously obtained LLM result (e.g. a cache)
+        get fresh timestamps and enrichment without another Bedrock call.
+
+        Args:
+            user_query: The user's question
+            llm_result: Dict with primary_intent, secondary_intents and entities
+            now: Optional shared reference time (batches)
+
+        Returns:
+            Same structure as classify()
+        """
         if not llm_result or 'primary_intent' not in llm_result:
             return {
                 "error": "Failed to classify intent",
@@ -274,66 +977,64 @@ Return ONLY the JSON object. No additional text.
         # Resolve timestamps from entities
         time_range = entities.get('time_range', 'current')
         comparison_range = entities.get('comparison_range')
-        timestamp_resolution = self.timestamp_resolver.resolve_time_range(time_range, comparison_range)
-
-        # Combine primary and secondary intents for enrichment
-        all_intents = [primary_intent] + secondary_intents if primary_intent else secondary_intents
+        timestamp_resolution = self.timestamp_resolver.resolve_time_range(time_range, comparison_range, now)
 
-        # Get enriched intents from enrichment rules
-        enriched_intents = self._get_enrichment_intents(all_intents)
+        # Enriched intents, data sources and enrichment details for this intent combination
+        enriched_intents, all_data_sources, primary_enrichments = self._cached_intent_closure(
+            primary_intent, tuple(sorted(set(secondary_intents)))
+        )
 
         # Build enrichment details
         enrichment_details = {}
-        if primary_intent and primary_intent in self.enrichment_rules:
-            enrichment_details[primary_intent] = self.enrichment_rules[primary_intent]
-
-        # Get required data sources from intent definitions (NOT from LLM)
-        # This ensures proper mapping based on intent_categories.yaml
-        all_data_sources = self._get_data_sources(enriched_intents)
+        if primary_enrichments:
+            enrichment_details[primary_intent] = list(primary_enrichments)
 
         return {
             "query": user_query,
             "primary_intent": primary_intent,
             "secondary_intents": secondary_intents,
             "entities": entities,
-            "enriched_intents": sorted(list(enriched_intents)),
-            "data_sources": all_data_sources,
+            "enriched_intents": list(enriched_intents),
+            "data_sources": list(all_data_sources),
             "enrichment_details": enrichment_details,
             "timestamp_resolution": timestamp_resolution
         }
 
     def print_result(self, result: Dict[str, Any]):
-        """Pretty print the classification result"""
+        """Pretty print the classification result (logged at INFO; skipped entirely when INFO is disabled)"""
         if "error" in result:
-            print(f"\n❌ Error: {result['error']}\n")
+            logger.error("\n❌ Error: %s\n", result['error'])
             return
 
-        print("\n" + "="*80)
-        print("INTENT CLASSIFICATION RESULT")
-        print("="*80)
-
-        print(f"\n📝 Query: {result['query']}")
+        if not logger.isEnabledFor(logging.INFO):
+            return
 
-        print(f"\n🎯 Primary Intent: {result['primary_intent']}")
+        lines = [
+            "\n" + "="*80,
+            "INTENT CLASSIFICATION RESULT",
+            "="*80,
+            f"\n📝 Query: {result['query']}",
+            f"\n🎯 Primary Intent: {result['primary_intent']}",
+        ]
 
         if result['secondary_intents']:
-            print(f"\n🔗 Secondary Intents: {', '.join(result['secondary_intents'])}")
+            lines.append(f"\n🔗 Secondary Intents: {', '.join(result['secondary_intents'])}")
 
-        print(f"\n📍 Entities Extracted:")
         entities = result.get('entities', {})
-        print(f"   • Service: {entities.get('service', 'N/A')}")
-        print(f"   • Time Range: {entities.get('time_range', 'current')}")
-        print(f"   • Comparison Range: {entities.get('comparison_range', 'N/A')}")
+        lines.append(f"\n📍 Entities Extracted:")
+        lines.append(f"   • Service: {entities.get('service', 'N/A')}")
+        lines.append(f"   • Time Range: {entities.get('time_range', 'current')}")
+        lines.append(f"   • Comparison Range: {entities.get('comparison_range', 'N/A')}")
 
-        # Print timestamp resolution
-        self._print_timestamp_resolution(result.get('timestamp_resolution'))
+        # Timestamp resolution
+        lines.extend(self._format_timestamp_resolution(result.get('timestamp_resolution')))
 
         if result['enrichment_details']:
-            print(f"\n🔄 Enrichment Applied:")
+            lines.append(f"\n🔄 Enrichment Applied:")
             for primary, enrichments in result['enrichment_details'].items():
-                print(f"   {primary} → {', '.join(enrichments)}")
+                lines.append(f"   {primary} → {', '.join(enrichments)}")
 
-        print(f"\n📊 All Intents (including enrichments):")
+        lines.append(f"\n📊 All Intents (including enrichments):")
         primary = result.get('primary_intent')
         secondary = result.get('secondary_intents', [])
         for intent in result['enriched_intents']:
@@ -343,40 +1044,71 @@ Return ONLY the JSON object. No additional text.
                 marker = "🔗"
             else:
                 marker = "  "
-            print(f"   {marker} {intent}")
+            lines.append(f"   {marker} {intent}")
 
-        print(f"\n💾 Data Sources Required:")
+        lines.append(f"\n💾 Data Sources Required:")
         for ds in result['data_sources']:
             # Get description from config
             ds_info = self.data_sources_config.get('data_sources', {}).get(ds, {})
             description = ds_info.get('description', 'No description')
-            print(f"   • {ds}: {description}")
+            lines.append(f"   • {ds}: {description}")
+
+        lines.append("\n" + "="*80 + "\n")
 
-        print("\n" + "="*80 + "\n")
+        # One logging call (one write) for the whole block
+        logger.info("\n".join(lines))
 
-    def _print_timestamp_resolution(self, timestamp_resolution: Dict[str, Any]):
-        """Print timestamp resolution details"""
+    def _format_timestamp_resolution(self, timestamp_resolution: Dict[str, Any]) -> List[str]:
+        """Format timestamp resolution details as output lines"""
         if not timestamp_resolution:
-            return
+            return []
 
-        print(f"\n⏱️  Step 3: Time Range Resolution")
-        print(f"   From Entities ex. time_range: \"{timestamp_resolution['primary_range']['time_range']}\"")
-        print(f"\n   Python converts:")
-        print(f"      start_time = {timestamp_resolution['primary_range']['start_time']}")
-        print(f"      end_time   = {timestamp_resolution['primary_range']['end_time']}")
-        print(f"      index      = {timestamp_resolution['index']}")
+        lines = [
+            f"\n⏱️  Step 3: Time Range Resolution",
+            f"   From Entities ex. time_range: \"{timestamp_resolution['primary_range']['time_range']}\"",
+            f"\n   Python converts:",
+            f"      start_time = {timestamp_resolution['primary_range']['start_time']}",
+            f"      end_time   = {timestamp_resolution['primary_range']['end_time']}",
+            f"      index      = {timestamp_resolution['index']}",
+        ]
 
         if timestamp_resolution['comparison_range']:
             comp = timestamp_resolution['comparison_range']
-            print(f"\n   Comparison Range:")
-            print(f"      start_time = {comp['start_time']}")
-            print(f"      end_time   = {comp['end_time']}")
+            lines.append(f"\n   Comparison Range:")
+            lines.append(f"      start_time = {comp['start_time']}")
+            lines.append(f"      end_time   = {comp['end_time']}")
+
+        lines.append(f"\n   Reason: {timestamp_resolution['index_reason']}")
+        return lines
 
-        print(f"\n   Reason: {timestamp_resolution['index_reason']}")
+
+# Process-wide classifier shared by every orchestrator in this process
+_CLASSIFIER: Optional[IntentClassifier] = None
+_CLASSIFIER_LOCK = threading.Lock()
+
+
+def get_intent_classifier() -> IntentClassifier:
+    """
+    Get the process-wide IntentClassifier, constructing it on first use only
+
+    Returns:
+        Shared IntentClassifier instance
+    """
+    global _CLASSIFIER
+
+    if _CLASSIFIER is None:
+        with _CLASSIFIER_LOCK:
+            if _CLASSIFIER is None:
+                _CLASSIFIER = IntentClassifier()
+
+    return _CLASSIFIER
 
 
 def main():
     """Main function for interactive testing"""
+    # Interactive CLI: show INFO output (print_result) as plain messages
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
     print("="*80)
     print("CONVERSATIONAL SLO MANAGER - INTENT CLASSIFIER")
     print("="*80)
@@ -4,11 +4,26 @@ Time Range Resolution Module
 Converts natural language time ranges to exact UTC timestamps and determines appropriate index granularity
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, Tuple, Any
-import pytz
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Tuple, Any, Optional
 import re
 
+
+def _midnight(dt: datetime) -> datetime:
+    """Truncate a datetime to the start of its day"""
+    return dt.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _last_hour(now: datetime) -> Tuple[datetime, datetime, float]:
+    """last_hour / current / unknown ranges: past 1 hour"""
+    return now - timedelta(hours=1), now, 0.04
+
+
+def _last_n_days(days: int) -> Callable[[datetime], Tuple[datetime, datetime, float]]:
+    """Handler for 'from midnight N days ago until now'"""
+    return lambda now: (_midnight(now - timedelta(days=days)), now, days)
+
+
 class TimestampResolver:
     """Resolves time ranges to UTC timestamps and determines index granularity"""
     
@@ -27,12 +42,41 @@ class TimestampResolver:
         'last_24_hours': 1,
         'current': 0.04,  # Treated as last_hour
     }
+
+    # Dynamic ranges: past_<number>_<unit>
+    _DYNAMIC_RE = re.compile(r'past[_\s](\d+)[_\s](day|days|hour|hours|week|weeks|month|months)')
+
+    # Static ranges: name -> handler(now) returning (start_time, end_time, duration_days)
+    _STATIC_HANDLERS: Dict[str, Callable[[datetime], Tuple[datetime, datetime, float]]] = {
+        'today': lambda now: (_midnight(now), now, 1),
+        'yesterday': lambda now: (_midnight(now - timedelta(days=1)), _midnight(now), 1),
+        'this_week': lambda now: (_midnight(now) - timedelta(days=now.weekday()), now, 7),
+        'last_week': lambda now: (
+            _midnight(now) - timedelta(days=now.weekday() + 7),
+            _midnight(now) - timedelta(days=now.weekday()),
+            7
+        ),
+        'last_3_days': _last_n_days(3),
+        'last_7_days': _last_n_days(7),
+        'last_30_days': _last_n_days(30),
+        # Last month / this month: 30 days
+        'last_month': _last_n_days(30),
+        'this_month': _last_n_days(30),
+        'last_hour': _last_hour,
+        # Treat "current" as "last_hour" for practical data fetching
+        'current': _last_hour,
+    }
     
     def __init__(self):
         """Initialize the timestamp resolver"""
-        self.utc = pytz.UTC
+        self.utc = timezone.utc
     
-    def resolve_time_range(self, time_range: str = None, comparison_range: str = None) -> Dict[str, Any]:
+    def resolve_time_range(
+        self,
+        time_range: str = None,
+        comparison_range: str = None,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
         """
         Resolve time range to exact UTC timestamps and determine index granularity
 
@@ -43,43 +87,39 @@ class TimestampResolver:
         Args:
             time_range: Time range string (e.g., "last_7_days", "today") or None
             comparison_range: Optional comparison range (e.g., "previous_7_days")
+            now: Reference UTC time; pass one shared value to resolve a batch consistently
 
         Returns:
             Dictionary with resolved timestamps and index information
         """
-        now = datetime.now(self.utc)
+        if now is None:
+            now = datetime.now(self.utc)
 
         # If TimeRange is NULL, default to past 1 hour
-        if time_range is None or time_range == "":
+        if not time_range:
             time_range = "last_hour"
 
-        # Parse primary time range
+        # Parse primary time range and convert straight to Unix ms
         primary_result = self._parse_time_range(time_range, now)
-
-        # Parse comparison range if provided
-        comparison_result = None
-        if comparison_range:
-            comparison_result = self._parse_time_range(comparison_range, now)
-
-        # Determine index based on duration
         duration_days = primary_result['duration_days']
         index = self._determine_index(duration_days)
 
-        # Format comparison range if it exists
+        # Parse and convert comparison range only if requested
         formatted_comparison = None
-        if comparison_result:
+        if comparison_range:
+            comparison_result = self._parse_time_range(comparison_range, now)
             formatted_comparison = {
                 'time_range': comparison_range,
-                'start_time': self._to_unix_timestamp_ms(comparison_result['start_time']),
-                'end_time': self._to_unix_timestamp_ms(comparison_result['end_time']),
+                'start_time': int(comparison_result['start_time'].timestamp() * 1000),
+                'end_time': int(comparison_result['end_time'].timestamp() * 1000),
                 'duration_days': comparison_result['duration_days'],
             }
 
         return {
             'primary_range': {
                 'time_range': time_range,
-                'start_time': self._to_unix_timestamp_ms(primary_result['start_time']),
-                'end_time': self._to_unix_timestamp_ms(primary_result['end_time']),
+                'start_time': int(primary_result['start_time'].timestamp() * 1000),
+                'end_time': int(primary_result['end_time'].timestamp() * 1000),
                 'duration_days': duration_days,
             },
             'comparison_range': formatted_comparison,
@@ -97,70 +137,19 @@ class TimestampResolver:
         """
         time_range_lower = time_range.lower().strip()
 
-        # Try to parse dynamic time ranges first (e.g., past_10_days, past_5_hours)
-        dynamic_result = self._parse_dynamic_time_range(time_range_lower, now)
-        if dynamic_result:
-            return dynamic_result
-
-        # Static time range patterns
-        if time_range_lower == 'today':
-            start_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            end_time = now
-            duration_days = 1
-
-        elif time_range_lower == 'yesterday':
-            yesterday = now - timedelta(days=1)
-            start_time = yesterday.replace(hour=0, minute=0, second=0, microsecond=0)
-            end_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            duration_days = 1
-
-        elif time_range_lower == 'this_week':
-            start_time = now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=now.weekday())
-            end_time = now
-            duration_days = 7
-
-        elif time_range_lower == 'last_week':
-            end_time = now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=now.weekday())
-            start_time = end_time - timedelta(days=7)
-            duration_days = 7
-
-        elif time_range_lower == 'last_3_days':
-            start_time = (now - timedelta(days=3)).replace(hour=0, minute=0, second=0, microsecond=0)
-            end_time = now
-            duration_days = 3
+        # Static time range patterns (single dict lookup)
+        handler = self._STATIC_HANDLERS.get(time_range_lower)
 
-        elif time_range_lower == 'last_7_days':
-            start_time = (now - timedelta(days=7)).replace(hour=0, minute=0, second=0, microsecond=0)
-            end_time = now
-            duration_days = 7
+        if handler is None:
+            # Try to parse dynamic time ranges (e.g., past_10_days, past_5_hours)
+            dynamic_result = self._parse_dynamic_time_range(time_range_lower, now)
+            if dynamic_result:
+                return dynamic_result
 
-        elif time_range_lower == 'last_30_days':
-            start_time = (now - timedelta(days=30)).replace(hour=0, minute=0, second=0, microsecond=0)
-            end_time = now
-            duration_days = 30
-
-        elif time_range_lower == 'last_month' or time_range_lower == 'this_month':
-            # Last month: 30 days
-            start_time = (now - timedelta(days=30)).replace(hour=0, minute=0, second=0, microsecond=0)
-            end_time = now
-            duration_days = 30
-
-        elif time_range_lower == 'last_hour':
-            start_time = now - timedelta(hours=1)
-            end_time = now
-            duration_days = 0.04
-
-        elif time_range_lower == 'current':
-            # Treat "current" as "last_hour" for practical data fetching
-            start_time = now - timedelta(hours=1)
-            end_time = now
-            duration_days = 0.04
-
-        else:
             # Default to last_hour (same as "current")
-            start_time = now - timedelta(hours=1)
-            end_time = now
-            duration_days = 0.04
+            handler = _last_hour
+
+        start_time, end_time, duration_days = handler(now)
 
         return {
             'start_time': start_time,
@@ -181,10 +170,8 @@ class TimestampResolver:
         Returns:
             Dictionary with start_time, end_time, duration_days or None if pattern doesn't match
         """
-        # Regex pattern to match: past_<number>_<unit>
-        # Supports both singular and plural forms
-        pattern = r'past[_\s](\d+)[_\s](day|days|hour|hours|week|weeks|month|months)'
-        match = re.match(pattern, time_range)
+        # Match: past_<number>_<unit> (singular and plural forms, precompiled)
+        match = self._DYNAMIC_RE.match(time_range)
 
         if not match:
             return None
@@ -241,31 +228,6 @@ class TimestampResolver:
         else:
             return "DAILY"
 
-    def _format_timestamp(self, dt: datetime) -> str:
-        """
-        Format datetime to simple readable format
-        Format: YYYY-MM-DD HH:MM:SS
-
-        Args:
-            dt: datetime object
-
-        Returns:
-            Formatted timestamp string
-        """
-        return dt.strftime("%Y-%m-%d %H:%M:%S")
-
-    def _to_unix_timestamp_ms(self, dt: datetime) -> int:
-        """
-        Convert datetime to Unix timestamp in milliseconds
-
-        Args:
-            dt: datetime object
-
-        Returns:
-            Unix timestamp in milliseconds
-        """
-        return int(dt.timestamp() * 1000)
-
 
 def main():
     """Test the timestamp resolver"""
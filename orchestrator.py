@@ -7,15 +7,37 @@ Coordinates intent classification and data fetching from multiple adapters
 import os
 import sys
 import json
-from typing import Dict, List, Any, Optional
+import hashlib
+import asyncio
+import logging
+import logging.handlers
+import queue
+import threading
+import argparse
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Any, Iterator, Optional, Tuple, Union
 from dotenv import load_dotenv
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+# orjson for result export when available (stdlib json otherwise)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Add project directories to path for imports (appended, so packages are never shadowed)
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.extend(
+    path for path in (_HERE, os.path.join(_HERE, 'intent_classifier'), os.path.join(_HERE, 'context_adapter'))
+    if path not in sys.path
+)
 
-# Add project directories to path for imports
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'intent_classifier'))
-sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'context_adapter'))
-
-from intent_classifier.intent_classifier import IntentClassifier
+from intent_classifier.intent_classifier import IntentClassifier, get_intent_classifier
 from context_adapter.java_stats import (
     fetch_api_data,
     transform_to_llm_format,
@@ -23,8 +45,132 @@ from context_adapter.java_stats import (
     get_service_health,
     get_error_budget_status
 )
-from context_adapter.memory_adapter import fetch_behavior_service_memory, transform_behavior_memory, fetch_patterns_by_intent
-from utils.service_matcher import ServiceMatcher
+from context_adapter.memory_adapter import iter_behavior_service_memory, transform_behavior_memory, fetch_patterns_by_intent
+from context_adapter.intent_based_queries import create_native_client
+from utils.service_matcher import get_service_matcher
+from utils.semantic_cache import SemanticCache, get_semantic_cache
+from utils.adapter_cache import AdapterCache, bucket_ms, make_key
+
+# Parse .env once per process, not per SLOOrchestrator()
+load_dotenv()
+
+logger = logging.getLogger("slo.orchestrator")
+
+# On-disk caches live next to this module (matching the /.slo_cache/ .gitignore entry),
+# whatever the working directory
+CACHE_DIR = os.path.join(_HERE, '.slo_cache')
+
+# Persistent pool for adapter fetches: reusing its threads keeps the per-thread ClickHouse
+# connections warm across queries. Sized for two adapters x default batch concurrency.
+ADAPTER_POOL_WORKERS = 10
+_ADAPTER_POOL = ThreadPoolExecutor(max_workers=ADAPTER_POOL_WORKERS, thread_name_prefix="slo-adapter")
+
+# LLM classification runs on its own pool so process_query can stop waiting on a hung
+# Bedrock call; after CLASSIFY_BREAKER_FAILURES consecutive failures (timeouts, exceptions
+# or error results) new classifications fail fast for CLASSIFY_BREAKER_COOLDOWN_SECONDS
+CLASSIFY_TIMEOUT_SECONDS = float(os.getenv('SLO_CLASSIFY_TIMEOUT', '10'))
+CLASSIFY_BREAKER_FAILURES = 5
+CLASSIFY_BREAKER_COOLDOWN_SECONDS = 30
+_CLASSIFY_POOL = ThreadPoolExecutor(max_workers=ADAPTER_POOL_WORKERS, thread_name_prefix="slo-classify")
+
+
+class KeepAliveHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled sockets use TCP keepalive (idle connections survive NAT/LB timeouts)"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        ]
+        super().init_poolmanager(*args, **kwargs)
+
+
+def _create_http_session() -> requests.Session:
+    """
+    Create the pooled HTTPS session used for Java Stats (and Keycloak) calls
+
+    Returns:
+        Session with a keepalive connection pool and retry policy mounted on https://
+    """
+    session = requests.Session()
+    session.mount("https://", KeepAliveHTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=50,
+        max_retries=Retry(total=3, backoff_factor=0.3)
+    ))
+    return session
+
+
+# Process-wide session shared by every orchestrator (TLS connections stay warm across instances)
+_HTTP_SESSION = _create_http_session()
+
+# export_to_json streams dict levels above this depth piecewise (top level, then each
+# adapter's payload), so only one adapter payload is serialized in memory at a time
+EXPORT_STREAM_DEPTH = 2
+
+# Buffer size of the export file writer
+EXPORT_WRITE_BUFFER = 64 * 1024
+
+
+def _iter_json_chunks(obj: Any, depth: int = 0) -> Iterator[bytes]:
+    """
+    Yield the orjson OPT_INDENT_2 encoding of obj in pieces
+
+    Dicts shallower than EXPORT_STREAM_DEPTH are emitted key by key; deeper values are
+    serialized whole and re-indented, so the concatenated output is byte-identical to
+    a one-shot orjson.dumps(obj, option=OPT_INDENT_2 | OPT_SERIALIZE_NUMPY).
+
+    Args:
+        obj: JSON-serializable value
+        depth: Nesting depth of obj
+
+    Yields:
+        Encoded bytes chunks
+    """
+    options = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+    indent = b"  " * depth
+
+    if not isinstance(obj, dict) or not obj or depth >= EXPORT_STREAM_DEPTH:
+        encoded = orjson.dumps(obj, option=options)
+        yield encoded.replace(b"\n", b"\n" + indent) if depth else encoded
+        return
+
+    yield b"{"
+    for i, (key, value) in enumerate(obj.items()):
+        yield (b",\n" if i else b"\n") + indent + b"  " + orjson.dumps(key) + b": "
+        yield from _iter_json_chunks(value, depth + 1)
+    yield b"\n" + indent + b"}"
+
+
+# Likely drill-down intents after a primary intent, prefetched when prefetch is enabled
+PREFETCH_FOLLOW_UPS = {
+    "SERVICE_HEALTH": ("ERROR_BUDGET_STATUS",),
+}
+
+
+def configure_background_logging(level: Union[int, str] = logging.INFO) -> logging.handlers.QueueListener:
+    """
+    Route all log records through a queue so formatting and stream I/O happen off-thread
+
+    Used by batch mode and for server/library use; the interactive main() logs
+    synchronously so output stays ordered with input prompts.
+
+    Args:
+        level: Root logger level (number or name)
+
+    Returns:
+        The started QueueListener (call .stop() on shutdown to flush)
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter('%(message)s'))
+
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(level)
+
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
 
 
 class SLOOrchestrator:
@@ -35,29 +181,131 @@ class SLOOrchestrator:
     3. Response aggregation
     """
 
-    def __init__(self):
-        """Initialize orchestrator with intent classifier and configuration"""
-        load_dotenv()
+    __slots__ = (
+        '_classifier_future', '_intent_cache_future', 'service_matcher', '_service_id_cache',
+        'app_id', 'java_stats_username', 'java_stats_password', '_java_dispatch',
+        'http', '_ch_local', 'adapter_cache', 'prefetch_enabled', '_prefetch_pool',
+        '_breaker', '_breaker_lock', 'verbose',
+    )
+
+    def __init__(self, verbose: bool = False, prefetch: bool = False):
+        """
+        Initialize orchestrator with intent classifier and configuration
+
+        Args:
+            verbose: Log step-by-step progress (INFO); otherwise only warnings and errors
+            prefetch: Warm the adapter cache for likely follow-up intents in the background
+        """
+        # Per-instance: the shared module logger's level is left to the application
+        self.verbose = verbose
 
-        # Initialize intent classifier
-        print("Initializing Intent Classifier...")
-        self.classifier = IntentClassifier()
-        print("✅ Intent Classifier ready")
+        # Initialize (or reuse) the process-wide intent classifier and the on-disk cache of
+        # intent/entity classifications (which may load an embedding model) in the background
+        self._info("Initializing Intent Classifier (background)...")
+        executor = ThreadPoolExecutor(max_workers=2)
+        self._classifier_future = executor.submit(get_intent_classifier)
+        self._intent_cache_future = executor.submit(get_semantic_cache, os.path.join(CACHE_DIR, 'intents'), 0.92)
+        executor.shutdown(wait=False)
 
         # Initialize service matcher
-        print("Initializing Service Matcher...")
+        self._info("Initializing Service Matcher...")
         try:
-            self.service_matcher = ServiceMatcher("services.yaml")
-            print(f"✅ Service Matcher ready ({len(self.service_matcher.services_by_id)} services loaded)\n")
+            self.service_matcher = get_service_matcher("services.yaml")
+            self._info("✅ Service Matcher ready (%s services loaded)\n", len(self.service_matcher.services_by_id))
         except FileNotFoundError:
-            print("⚠️  services.yaml not found - service matching disabled\n")
+            logger.warning("⚠️  services.yaml not found - service matching disabled\n")
             self.service_matcher = None
 
+        # Resolved service name -> (service_id, service_path, score) or None, shared across queries
+        self._service_id_cache: Dict[str, Optional[Tuple[int, str, float]]] = {}
+
         # Configuration - can be moved to .env or config file
         self.app_id = 31854  # Default application ID
         self.java_stats_username = os.getenv('JAVA_STATS_USERNAME', 'wmadmin')
         self.java_stats_password = os.getenv('JAVA_STATS_PASSWORD', 'WM@Dm1n@#2024!!$')
 
+        # Java Stats intent dispatch, in priority order:
+        # (intent, result key, handler, accepts service_id, requires service_id)
+        self._java_dispatch = (
+            ("SERVICE_HEALTH", "service_health", get_service_health, True, True),
+            ("ERROR_BUDGET_STATUS", "error_budget", get_error_budget_status, True, False),
+            ("CURRENT_HEALTH", "current_health", get_current_health, False, False),
+        )
+
+        # Pooled HTTPS session shared by all Java Stats calls (keeps TLS connections warm)
+        self.http = _HTTP_SESSION
+
+        # Native-protocol ClickHouse clients, one per thread (None -> HTTP interface)
+        self._ch_local = threading.local()
+
+        # Short-lived on-disk cache of adapter responses
+        self.adapter_cache = AdapterCache(path=os.path.join(CACHE_DIR, 'adapters'), ttl_seconds=300)
+
+        # Speculative follow-up fetches (bounded, results land in adapter_cache)
+        self.prefetch_enabled = prefetch
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=2) if prefetch else None
+
+        # Circuit breaker around LLM classification (shared by batch worker threads)
+        self._breaker = {'failures': 0, 'open_until': 0.0}
+        self._breaker_lock = threading.Lock()
+
+    def _info(self, msg: str, *args: Any):
+        """Log step-by-step progress (INFO), for verbose orchestrators only"""
+        if self.verbose:
+            logger.info(msg, *args)
+
+    @property
+    def ch_client(self) -> Optional[Any]:
+        """Native ClickHouse client of the calling thread (clickhouse-driver clients are not thread-safe)"""
+        if not hasattr(self._ch_local, 'client'):
+            self._ch_local.client = create_native_client()
+        return self._ch_local.client
+
+    @property
+    def intent_cache(self) -> SemanticCache:
+        """Semantic intent cache (blocks on first access until background init finishes)"""
+        return self._intent_cache_future.result()
+
+    @property
+    def classifier(self) -> IntentClassifier:
+        """Intent classifier (blocks on first access until background init finishes)"""
+        return self._classifier_future.result()
+
+    def _classify_with_breaker(self, user_query: str) -> Dict[str, Any]:
+        """
+        Classify a query with a timeout, failing fast while the circuit breaker is open
+
+        Args:
+            user_query: Natural language query from user
+
+        Returns:
+            Classification result, or a dict with an "error" key on timeout, failure or open circuit
+        """
+        with self._breaker_lock:
+            if time.monotonic() < self._breaker['open_until']:
+                return {"error": "circuit_open", "query": user_query}
+
+        future = _CLASSIFY_POOL.submit(self.classifier.classify, user_query)
+        try:
+            result = future.result(timeout=CLASSIFY_TIMEOUT_SECONDS)
+        except FutureTimeoutError:
+            logger.warning("⚠️  Intent classification timed out after %ss", CLASSIFY_TIMEOUT_SECONDS)
+            result = {"error": "Intent classification timed out", "query": user_query}
+        except Exception as e:
+            logger.error("❌ Intent classification failed: %s", e)
+            result = {"error": f"Intent classification failed: {e}", "query": user_query}
+
+        with self._breaker_lock:
+            if "error" not in result:
+                self._breaker['failures'] = 0
+            else:
+                self._breaker['failures'] += 1
+                if self._breaker['failures'] >= CLASSIFY_BREAKER_FAILURES:
+                    self._breaker['open_until'] = time.monotonic() + CLASSIFY_BREAKER_COOLDOWN_SECONDS
+                    logger.warning("⚠️  %s consecutive classification failures, pausing LLM calls for %ss",
+                                   self._breaker['failures'], CLASSIFY_BREAKER_COOLDOWN_SECONDS)
+        return result
+
     def process_query(self, user_query: str, service_name: Optional[str] = None) -> Dict[str, Any]:
         """
         Process a user query end-to-end
@@ -72,14 +320,28 @@ class SLOOrchestrator:
             - data: Aggregated data from all adapters
             - metadata: Processing metadata
         """
-        print("="*80)
-        print("SLO ORCHESTRATOR - Processing Query")
-        print("="*80)
-        print(f"\n📝 Query: {user_query}\n")
+        # Banners are only built when INFO is enabled (verbose mode)
+        if self.verbose and logger.isEnabledFor(logging.INFO):
+            self._info("="*80)
+            self._info("SLO ORCHESTRATOR - Processing Query")
+            self._info("="*80)
+            self._info("\n📝 Query: %s\n", user_query)
 
         # Step 1: Classify intent
-        print("🔍 Step 1: Analyzing intent...")
-        classification_result = self.classifier.classify(user_query)
+        self._info("🔍 Step 1: Analyzing intent...")
+        cached_llm_result = self.intent_cache.get(user_query)
+        if cached_llm_result:
+            # Timestamps and enrichment are rebuilt fresh from the cached intent/entities
+            self._info("   ✓ Reusing cached classification")
+            classification_result = self.classifier.build_result(user_query, cached_llm_result)
+        else:
+            classification_result = self._classify_with_breaker(user_query)
+            if "error" not in classification_result:
+                self.intent_cache.put(user_query, {
+                    "primary_intent": classification_result['primary_intent'],
+                    "secondary_intents": classification_result['secondary_intents'],
+                    "entities": classification_result['entities']
+                })
 
         if "error" in classification_result:
             return {
@@ -88,21 +350,42 @@ class SLOOrchestrator:
                 "query": user_query
             }
 
-        # Print classification result
-        self.classifier.print_result(classification_result)
+        # Nothing to fetch (e.g. unclassifiable query): skip time/service resolution and adapters
+        entities = classification_result.get('entities', {})
+        data_sources = classification_result.get('data_sources', [])
+        if not data_sources:
+            self._info("   ⚠️  No data sources for intent %s, skipping adapters",
+                        classification_result.get('primary_intent'))
+            return {
+                "success": True,
+                "query": user_query,
+                "classification": {
+                    "primary_intent": classification_result.get('primary_intent'),
+                    "secondary_intents": classification_result.get('secondary_intents', []),
+                    "enriched_intents": classification_result.get('enriched_intents', []),
+                    "entities": entities
+                },
+                "data_sources_used": [],
+                "data": {}
+            }
+
+        # Print classification result (verbose mode only)
+        if self.verbose and logger.isEnabledFor(logging.INFO):
+            self.classifier.print_result(classification_result)
 
         # Step 2: Extract parameters
-        entities = classification_result.get('entities', {})
         service = service_name or entities.get('service')
-        data_sources = classification_result.get('data_sources', [])
         timestamp_resolution = classification_result.get('timestamp_resolution', {})
 
         # Collect all intents (primary + secondary + enriched) for pattern routing
-        all_intents = set()
-        all_intents.add(classification_result.get('primary_intent'))
-        all_intents.update(classification_result.get('secondary_intents', []))
-        all_intents.update(classification_result.get('enriched_intents', []))
-        all_intents.discard(None)  # Remove None if present
+        all_intents = {
+            intent for intent in (
+                classification_result.get('primary_intent'),
+                *classification_result.get('secondary_intents', ()),
+                *classification_result.get('enriched_intents', ())
+            )
+            if intent is not None
+        }
 
         if not timestamp_resolution:
             return {
@@ -116,66 +399,39 @@ class SLOOrchestrator:
         end_time = primary_range.get('end_time')
         index = timestamp_resolution.get('index')
 
-        print(f"\n📊 Step 2: Fetching data from adapters...")
-        print(f"   Data Sources: {', '.join(data_sources)}")
-        print(f"   Time Range: {start_time} to {end_time}")
-        print(f"   Index: {index}\n")
+        self._info("\n📊 Step 2: Fetching data from adapters...")
+        self._info("   Data Sources: %s", ', '.join(data_sources))
+        self._info("   Time Range: %s to %s", start_time, end_time)
+        self._info("   Index: %s\n", index)
 
         # Step 3: Fetch data from adapters
         adapter_data = {}
 
         # Resolve service_id if service mentioned
-        service_id = None
-        if service and self.service_matcher:
-            print(f"   Resolving service name: '{service}'")
-            matches = self.service_matcher.find_matches(service, threshold=0.3, max_results=1)
-            if matches:
-                service_id = matches[0]['service_id']
-                matched_path = matches[0]['service_path']
-                score = matches[0]['similarity_score']
-                print(f"   ✓ Matched to service_id={service_id} ({matched_path}, score={score:.3f})\n")
-            else:
-                print(f"   ⚠️  No service match found for '{service}'\n")
-
-        # Fetch from Java Stats API
-        if 'java_stats_api' in data_sources:
-            print("   → Fetching from Java Stats API...")
-            java_data = self._fetch_java_stats(
-                start_time_ms=str(start_time),
-                end_time_ms=str(end_time),
-                index=index,
-                intents=all_intents,
-                service_id=service_id
-            )
-            if java_data:
-                adapter_data['java_stats_api'] = java_data
-                print("   ✅ Java Stats API data retrieved\n")
-            else:
-                print("   ⚠️  Java Stats API returned no data\n")
-
-        # Fetch from ClickHouse (memory adapter)
-        if 'clickhouse' in data_sources:
-            print("   → Fetching from ClickHouse (behavior memory)...")
-            memory_data = self._fetch_memory_adapter(
-                start_time=start_time,
-                end_time=end_time,
-                service_name=service,
-                intents=all_intents,
-                incident_timestamp=None  # Could extract from entities if needed
-            )
-            if memory_data:
-                adapter_data['clickhouse'] = memory_data
-                print("   ✅ ClickHouse data retrieved\n")
-            else:
-                print("   ⚠️  ClickHouse returned no data\n")
+        service_id = self._resolve_service(service)
+        self._info("")
+
+        # Fetch from Java Stats API and ClickHouse concurrently
+        adapter_data.update(self._fetch_adapters(
+            data_sources=data_sources,
+            start_time=start_time,
+            end_time=end_time,
+            index=index,
+            intents=all_intents,
+            service_id=service_id,
+            service_name=service
+        ))
+
+        if self.prefetch_enabled and 'java_stats_api' in data_sources:
+            self._prefetch_follow_ups(classification_result, all_intents, start_time, end_time, index, service_id)
 
         # Note: postgres and opensearch adapters not yet implemented
         if 'postgres' in data_sources:
-            print("   ⚠️  Postgres adapter not yet implemented")
+            logger.warning("   ⚠️  Postgres adapter not yet implemented")
             adapter_data['postgres'] = {"status": "not_implemented"}
 
         if 'opensearch' in data_sources:
-            print("   ⚠️  OpenSearch adapter not yet implemented")
+            logger.warning("   ⚠️  OpenSearch adapter not yet implemented")
             adapter_data['opensearch'] = {"status": "not_implemented"}
 
         # Step 4: Build final response
@@ -203,18 +459,231 @@ class SLOOrchestrator:
             }
         }
 
-        print("="*80)
-        print("✅ ORCHESTRATION COMPLETE")
-        print("="*80)
-        print(f"\nData sources fetched: {', '.join(adapter_data.keys())}")
-        print(f"Total data keys: {len(adapter_data)}\n")
+        if self.verbose and logger.isEnabledFor(logging.INFO):
+            self._info("="*80)
+            self._info("✅ ORCHESTRATION COMPLETE")
+            self._info("="*80)
+            self._info("\nData sources fetched: %s", ', '.join(adapter_data.keys()))
+            self._info("Total data keys: %s\n", len(adapter_data))
 
         return result
 
+    def _prefetch_follow_ups(
+        self,
+        classification_result: Dict[str, Any],
+        all_intents: set,
+        start_time: int,
+        end_time: int,
+        index: str,
+        service_id: Optional[int]
+    ):
+        """
+        Submit background Java Stats fetches for likely follow-up queries
+
+        Each follow-up intent is expanded exactly as process_query would expand it,
+        so a later query for it hits the same adapter cache entry.
+
+        Args:
+            classification_result: Classification of the current query
+            all_intents: Intents the current query was routed on
+            start_time: Start time in milliseconds
+            end_time: End time in milliseconds
+            index: Time granularity (HOURLY, DAILY, etc.)
+            service_id: Resolved service ID or None
+        """
+        java_intents = {intent for intent, *_ in self._java_dispatch}
+        candidates = {
+            *classification_result.get('secondary_intents', ()),
+            *PREFETCH_FOLLOW_UPS.get(classification_result.get('primary_intent'), ())
+        }
+
+        for intent in sorted(candidates & java_intents):
+            follow_up_intents = self.classifier.expand_intents(intent)
+            if follow_up_intents == all_intents:
+                continue
+            self._info("   → Prefetching %s in background", intent)
+            self._prefetch_pool.submit(
+                self._fetch_java_stats, start_time, end_time, index, follow_up_intents, service_id
+            )
+
+    def _resolve_service(self, service: Optional[str]) -> Optional[int]:
+        """
+        Resolve a service name to its best-matching service_id, memoized per name
+
+        Args:
+            service: Service name from the query (or None)
+
+        Returns:
+            Matched service_id or None
+        """
+        if not service or not self.service_matcher:
+            return None
+
+        key = service.lower()
+        if key not in self._service_id_cache:
+            self._info("   Resolving service name: '%s'", service)
+            matches = self.service_matcher.find_matches(service, threshold=0.3, max_results=1)
+            self._service_id_cache[key] = (
+                (matches[0]['service_id'], matches[0]['service_path'], matches[0]['similarity_score'])
+                if matches else None
+            )
+
+        match = self._service_id_cache[key]
+        if match is None:
+            logger.warning("   ⚠️  No service match found for '%s'", service)
+            return None
+
+        service_id, matched_path, score = match
+        self._info("   ✓ Matched to service_id=%s (%s, score=%.3f)", service_id, matched_path, score)
+        return service_id
+
+    def _fetch_adapters(
+        self,
+        data_sources: List[str],
+        start_time: int,
+        end_time: int,
+        index: str,
+        intents: set,
+        service_id: Optional[int],
+        service_name: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        Fetch the Java Stats and ClickHouse adapters concurrently
+
+        Both adapters are blocking HTTP clients, so each runs on the shared adapter pool
+        and the total wait is the slower of the two rather than their sum. No event loop
+        is involved, so this also works when called from async code (FastAPI, Jupyter).
+
+        Args:
+            data_sources: Data sources required by the classification
+            start_time: Start time in milliseconds
+            end_time: End time in milliseconds
+            index: Time granularity (HOURLY, DAILY, etc.)
+            intents: Set of all intents (primary + secondary + enriched)
+            service_id: Resolved service ID or None
+            service_name: Service name from the query or None
+
+        Returns:
+            Adapter data keyed by data source (only adapters that returned data)
+        """
+        pending = {}
+
+        if 'java_stats_api' in data_sources:
+            self._info("   → Fetching from Java Stats API...")
+            pending['java_stats_api'] = _ADAPTER_POOL.submit(
+                self._fetch_java_stats,
+                start_time_ms=start_time,
+                end_time_ms=end_time,
+                index=index,
+                intents=intents,
+                service_id=service_id
+            )
+
+        if 'clickhouse' in data_sources:
+            self._info("   → Fetching from ClickHouse (behavior memory)...")
+            pending['clickhouse'] = _ADAPTER_POOL.submit(
+                self._fetch_memory_adapter,
+                start_time=start_time,
+                end_time=end_time,
+                service_name=service_name,
+                service_id=service_id,
+                intents=intents,
+                incident_timestamp=None  # Could extract from entities if needed
+            )
+
+        wait(pending.values())
+
+        labels = {'java_stats_api': "Java Stats API", 'clickhouse': "ClickHouse"}
+        adapter_data = {}
+        for source, future in pending.items():
+            error = future.exception()
+            data = future.result() if error is None else None
+            if error is not None:
+                logger.error("   ✗ Error fetching %s: %s", labels[source], error)
+            elif data:
+                adapter_data[source] = data
+                self._info("   ✅ %s data retrieved", labels[source])
+            else:
+                logger.warning("   ⚠️  %s returned no data", labels[source])
+
+        return adapter_data
+
     def _fetch_java_stats(
         self,
-        start_time_ms: str,
-        end_time_ms: str,
+        start_time_ms: int,
+        end_time_ms: int,
+        index: str,
+        intents: Optional[set] = None,
+        service_id: Optional[int] = None,
+        cache: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fetch Java Stats data, served from the adapter cache when the same window was fetched recently
+
+        Args:
+            start_time_ms: Start time in milliseconds
+            end_time_ms: End time in milliseconds
+            index: Time granularity (HOURLY, DAILY, etc.)
+            intents: Set of all intents (primary + secondary + enriched)
+            service_id: Optional service ID for service-specific queries
+            cache: Set False to bypass the cache
+
+        Returns:
+            Transformed LLM-ready data or None if failed
+        """
+        if not cache:
+            return self._fetch_java_stats_uncached(start_time_ms, end_time_ms, index, intents, service_id)
+
+        key = make_key(
+            adapter='java_stats_api',
+            app_id=self.app_id,
+            service_id=service_id,
+            intents=intents or (),
+            index=index,
+            start=bucket_ms(start_time_ms, index),
+            end=bucket_ms(end_time_ms, index)
+        )
+        cached = self.adapter_cache.get(key)
+        if cached is not None:
+            self._info("   ✓ Java Stats served from cache")
+            return cached
+
+        result = self._fetch_java_stats_uncached(start_time_ms, end_time_ms, index, intents, service_id)
+
+        # A merged multi-intent result with a failed fetch (None entry) is returned but not
+        # cached, so the next query retries instead of serving the gap for the cache TTL
+        partial = (
+            result is not None
+            and len(self._java_stats_routes(intents, service_id)) > 1
+            and any(value is None for value in result.values())
+        )
+        if result is not None and not partial:
+            self.adapter_cache.set(key, result)
+        return result
+
+    def _java_stats_routes(self, intents: Optional[set], service_id: Optional[int]) -> list:
+        """
+        Select the Java Stats handlers for a set of intents
+
+        Args:
+            intents: Set of all intents (primary + secondary + enriched)
+            service_id: Optional service ID (handlers that require one are skipped without it)
+
+        Returns:
+            (result key, handler, accepts service_id) tuples in dispatch priority order
+        """
+        if not intents:
+            return []
+        return [
+            (key, fetch, accepts_sid)
+            for intent, key, fetch, accepts_sid, needs_sid in self._java_dispatch
+            if intent in intents and (not needs_sid or service_id is not None)
+        ]
+
+    def _fetch_java_stats_uncached(
+        self,
+        start_time_ms: int,
+        end_time_ms: int,
         index: str,
         intents: Optional[set] = None,
         service_id: Optional[int] = None
@@ -224,12 +693,16 @@ class SLOOrchestrator:
 
         Routes to specific functions based on intent:
         - CURRENT_HEALTH: Application-wide health across all services
-        - SERVICE_HEALTH: Health for a specific service (requires service_id)
+        - SERVICE_HEALTH: Health for a specific service (skipped without service_id)
         - ERROR_BUDGET_STATUS: Error budget data (EB category only)
 
+        A single matching intent returns that function's payload directly; several
+        are fetched concurrently and returned as {"service_health": ...,
+        "error_budget": ..., "current_health": ...} (only the matching keys).
+
         Args:
-            start_time_ms: Start time in milliseconds (string)
-            end_time_ms: End time in milliseconds (string)
+            start_time_ms: Start time in milliseconds
+            end_time_ms: End time in milliseconds
             index: Time granularity (HOURLY, DAILY, etc.)
             intents: Set of all intents (primary + secondary + enriched)
             service_id: Optional service ID for service-specific queries
@@ -238,54 +711,54 @@ class SLOOrchestrator:
             Transformed LLM-ready data or None if failed
         """
         try:
-            # Intent-based routing
-            if intents:
-                # Priority order: SERVICE_HEALTH > ERROR_BUDGET_STATUS > CURRENT_HEALTH
-
-                # SERVICE_HEALTH - requires service_id
-                if "SERVICE_HEALTH" in intents:
-                    return get_service_health(
-                        app_id=self.app_id,
-                        start_time=start_time_ms,
-                        end_time=end_time_ms,
-                        service_id=service_id,
-                        index=index,
-                        username=self.java_stats_username,
-                        password=self.java_stats_password
-                    )
-
-                # ERROR_BUDGET_STATUS - can work with or without service_id
-                elif "ERROR_BUDGET_STATUS" in intents:
-                    return get_error_budget_status(
-                        app_id=self.app_id,
-                        start_time=start_time_ms,
-                        end_time=end_time_ms,
-                        index=index,
-                        username=self.java_stats_username,
-                        password=self.java_stats_password,
-                        service_id=service_id
-                    )
-
-                # CURRENT_HEALTH - application-wide
-                elif "CURRENT_HEALTH" in intents:
-                    return get_current_health(
-                        app_id=self.app_id,
-                        start_time=start_time_ms,
-                        end_time=end_time_ms,
-                        index=index,
-                        username=self.java_stats_username,
-                        password=self.java_stats_password
-                    )
+            # Intent-based routing: every matching Java Stats intent is fetched
+            common = {
+                "app_id": self.app_id,
+                "start_time": start_time_ms,
+                "end_time": end_time_ms,
+                "index": index,
+                "username": self.java_stats_username,
+                "password": self.java_stats_password,
+                "session": self.http
+            }
+            with_service = {**common, "service_id": service_id}
+            tasks = [
+                (key, fetch, with_service if accepts_sid else common)
+                for key, fetch, accepts_sid in self._java_stats_routes(intents, service_id)
+            ]
+
+            # Single intent: call directly, no executor overhead
+            if len(tasks) == 1:
+                _, fetch, kwargs = tasks[0]
+                return fetch(**kwargs)
+
+            # Several intents: fetch concurrently and merge
+            if tasks:
+                merged = {name: None for name, _, _ in tasks}  # Stable key order
+                with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+                    futures = {executor.submit(fetch, **kwargs): name for name, fetch, kwargs in tasks}
+                    for future in as_completed(futures):
+                        name = futures[future]
+                        try:
+                            merged[name] = future.result()
+                        except Exception as e:
+                            logger.error("   ✗ Error fetching Java Stats %s: %s", name, e)
+
+                # Every fetch failed: report failure rather than a dict of Nones
+                if all(value is None for value in merged.values()):
+                    return None
+                return merged
 
             # Fallback: Use general fetch_api_data + transform (backward compatibility)
-            print("   Using general java_stats fetch (no specific intent matched)")
+            self._info("   Using general java_stats fetch (no specific intent matched)")
             raw_data = fetch_api_data(
                 start_time_ms=start_time_ms,
                 end_time_ms=end_time_ms,
                 username=self.java_stats_username,
                 password=self.java_stats_password,
                 application_id=self.app_id,
-                index=index
+                index=index,
+                session=self.http
             )
 
             if not raw_data:
@@ -296,7 +769,7 @@ class SLOOrchestrator:
             return transformed
 
         except Exception as e:
-            print(f"   ✗ Error fetching Java Stats: {e}")
+            logger.error("   ✗ Error fetching Java Stats: %s", e)
             return None
 
     def _fetch_memory_adapter(
@@ -304,6 +777,59 @@ class SLOOrchestrator:
         start_time: int,
         end_time: int,
         service_name: Optional[str] = None,
+        service_id: Optional[int] = None,
+        intents: Optional[set] = None,
+        incident_timestamp: Optional[int] = None,
+        cache: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fetch ClickHouse pattern data, served from the adapter cache when the same window was fetched recently
+
+        Args:
+            start_time: Start time in milliseconds
+            end_time: End time in milliseconds
+            service_name: Optional service name filter (from intent classifier)
+            service_id: Service ID already resolved by process_query (or None)
+            intents: Set of all intents (primary + secondary + enriched)
+            incident_timestamp: Optional incident timestamp for RECURRING_INCIDENT
+            cache: Set False to bypass the cache
+
+        Returns:
+            Intent-based pattern data or None if failed
+        """
+        if not cache:
+            return self._fetch_memory_adapter_uncached(
+                start_time, end_time, service_name, service_id, intents, incident_timestamp
+            )
+
+        key = make_key(
+            adapter='clickhouse',
+            app_id=self.app_id,
+            service_name=service_name,
+            service_id=service_id,
+            intents=intents or (),
+            start=bucket_ms(start_time, "HOURLY"),
+            end=bucket_ms(end_time, "HOURLY"),
+            incident_timestamp=incident_timestamp
+        )
+        cached = self.adapter_cache.get(key)
+        if cached is not None:
+            self._info("   ✓ ClickHouse data served from cache")
+            return cached
+
+        result = self._fetch_memory_adapter_uncached(
+            start_time, end_time, service_name, service_id, intents, incident_timestamp
+        )
+        if result is not None:
+            self.adapter_cache.set(key, result)
+        return result
+
+    def _fetch_memory_adapter_uncached(
+        self,
+        start_time: int,
+        end_time: int,
+        service_name: Optional[str] = None,
+        service_id: Optional[int] = None,
         intents: Optional[set] = None,
         incident_timestamp: Optional[int] = None
     ) -> Optional[Dict[str, Any]]:
@@ -314,6 +840,7 @@ class SLOOrchestrator:
             start_time: Start time in milliseconds
             end_time: End time in milliseconds
             service_name: Optional service name filter (from intent classifier)
+            service_id: Service ID already resolved by process_query (or None)
             intents: Set of all intents (primary + secondary + enriched)
             incident_timestamp: Optional incident timestamp for RECURRING_INCIDENT
 
@@ -321,20 +848,7 @@ class SLOOrchestrator:
             Intent-based pattern data or None if failed
         """
         try:
-            # Step 1: Resolve service name to service_id
-            service_id = None
-            if service_name and self.service_matcher:
-                print(f"   Resolving service name: '{service_name}'")
-                matches = self.service_matcher.find_matches(service_name, threshold=0.3, max_results=1)
-                if matches:
-                    service_id = matches[0]['service_id']
-                    matched_path = matches[0]['service_path']
-                    score = matches[0]['similarity_score']
-                    print(f"   ✓ Matched to service_id={service_id} ({matched_path}, score={score:.3f})")
-                else:
-                    print(f"   ⚠️  No service match found for '{service_name}'")
-
-            # Step 2: Use intent-based routing if intents provided
+            # Use intent-based routing if intents provided
             if intents:
                 result = fetch_patterns_by_intent(
                     intents=intents,
@@ -343,59 +857,191 @@ class SLOOrchestrator:
                     app_id=self.app_id,
                     service_id=service_id,
                     service_name=service_name,
-                    incident_timestamp=incident_timestamp
+                    incident_timestamp=incident_timestamp,
+                    client=self.ch_client
                 )
                 return result
             else:
                 # Fallback to general fetch (backward compatibility)
-                raw_data = fetch_behavior_service_memory(
+                # Rows are streamed straight into the transform (no intermediate list)
+                rows = iter_behavior_service_memory(
                     start_time=start_time,
                     end_time=end_time,
                     app_id=self.app_id,
-                    sid=service_name
+                    sid=service_name,
+                    client=self.ch_client
                 )
 
-                if not raw_data:
-                    return None
-
                 transformed = transform_behavior_memory(
-                    rows=raw_data,
+                    rows=rows,
                     start_time=start_time,
                     end_time=end_time,
                     app_id=self.app_id,
                     sid=service_name
                 )
+
+                if not transformed["stats"]["total_records"]:
+                    return None
+
                 return transformed
 
         except Exception as e:
-            print(f"   ✗ Error fetching ClickHouse data: {e}")
+            logger.error("   ✗ Error fetching ClickHouse data: %s", e)
             return None
 
-    def export_to_json(self, result: Dict[str, Any], filepath: str):
+    @staticmethod
+    def export_filename(result: Dict[str, Any]) -> str:
+        """
+        Build a content-addressed export filename for a result
+
+        Identical results map to the same file, so re-exporting is a no-op and
+        different results for the same time bucket no longer overwrite each other.
+
+        Args:
+            result: Orchestrator result dictionary
+
+        Returns:
+            Filename of the form slo_result_<start_time>_<content hash>.json
+        """
+        if orjson is not None:
+            canonical = orjson.dumps(result, option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        else:
+            canonical = json.dumps(result, sort_keys=True, default=str).encode('utf-8')
+        digest = hashlib.blake2b(canonical, digest_size=8).hexdigest()
+
+        start_time = result.get('time_resolution', {}).get('start_time')
+        prefix = f"slo_result_{int(start_time)}" if start_time is not None else "slo_result"
+        return f"{prefix}_{digest}.json"
+
+    def export_to_json(self, result: Dict[str, Any], filepath: str, skip_existing: bool = False):
         """
         Export orchestrator result to JSON file
 
         Args:
             result: Orchestrator result dictionary
             filepath: Path to output JSON file
+            skip_existing: Don't rewrite an existing file (for content-addressed names
+                from export_filename(), where an existing file already has this content)
         """
+        if skip_existing and os.path.exists(filepath):
+            self._info("✅ Result already exported to %s", filepath)
+            return
+
+        # Written to a temp file in the same directory and renamed into place, so a failed
+        # export never leaves a truncated file that skip_existing would then keep forever
+        # (unique per process/thread, opened normally so the usual umask permissions apply)
+        tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
         try:
-            with open(filepath, 'w') as f:
-                json.dump(result, f, indent=2)
-            print(f"✅ Result exported to {filepath}")
+            # Stream section by section (peak memory ~ largest adapter payload, not the file)
+            if orjson is not None:
+                with open(tmp_path, 'wb', buffering=EXPORT_WRITE_BUFFER) as f:
+                    for chunk in _iter_json_chunks(result):
+                        f.write(chunk)
+            else:
+                # json.dump already writes iterencode() chunks as they are produced
+                with open(tmp_path, 'w', encoding='utf-8', buffering=EXPORT_WRITE_BUFFER) as f:
+                    json.dump(result, f, indent=2, default=str)
+            os.replace(tmp_path, filepath)
+            tmp_path = None
+            self._info("✅ Result exported to %s", filepath)
         except Exception as e:
-            print(f"✗ Failed to export to JSON: {e}")
+            logger.error("✗ Failed to export to JSON: %s", e)
+        finally:
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+
+async def run_batch(
+    orchestrator: SLOOrchestrator,
+    queries: List[str],
+    concurrency: int = 5
+) -> List[Dict[str, Any]]:
+    """
+    Process many queries concurrently with bounded parallelism
+
+    Each query runs the regular synchronous pipeline on a worker thread, so the
+    classifier, caches and HTTP pools of the orchestrator are shared.
+
+    Args:
+        orchestrator: Orchestrator to run the queries through
+        queries: Natural language queries
+        concurrency: Maximum number of queries in flight
+
+    Returns:
+        Results in the same order as queries
+    """
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return await asyncio.gather(*(
+            loop.run_in_executor(pool, orchestrator.process_query, query)
+            for query in queries
+        ))
+
+
+def main_batch(batch_path: str, output_path: str, concurrency: int):
+    """
+    Run every query in a file (one per line) and write the results as JSON lines
+
+    Args:
+        batch_path: Text file with one query per line (blank lines ignored)
+        output_path: Destination JSON-lines file
+        concurrency: Maximum number of queries in flight
+    """
+    # Worker threads log through a queue instead of contending for the stream
+    log_listener = configure_background_logging(os.getenv('LOG_LEVEL', 'WARNING').upper())
+
+    with open(batch_path, 'r') as f:
+        queries = [line.strip() for line in f if line.strip()]
+
+    print(f"Processing {len(queries)} queries (concurrency={concurrency})...")
+    try:
+        orchestrator = SLOOrchestrator()
+        results = asyncio.run(run_batch(orchestrator, queries, concurrency))
+    finally:
+        log_listener.stop()  # Flush queued records before the summary
+
+    with open(output_path, 'wb') as f:
+        for result in results:
+            if orjson is not None:
+                f.write(orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n")
+            else:
+                f.write(json.dumps(result, default=str).encode('utf-8') + b"\n")
+
+    succeeded = sum(1 for result in results if result.get('success'))
+    print(f"✅ {succeeded}/{len(results)} queries succeeded, results written to {output_path}")
 
 
 def main():
-    """Main function for interactive testing"""
+    """Main function for interactive testing (or --batch for scripted workloads)"""
+    # Start building the shared IntentClassifier right away so it overlaps with argument
+    # parsing and startup output; SLOOrchestrator() then just waits on the singleton's lock.
+    # Only the CLI does this - importing the module has no side effects. SLO_PRELOAD=0 skips it.
+    if os.getenv('SLO_PRELOAD', '1') != '0':
+        threading.Thread(target=get_intent_classifier, name="slo-preload", daemon=True).start()
+
+    parser = argparse.ArgumentParser(description="Conversational SLO Manager orchestrator")
+    parser.add_argument("--batch", help="File with one query per line; runs non-interactively")
+    parser.add_argument("--concurrency", type=int, default=5, help="Queries in flight in batch mode (default: 5)")
+    parser.add_argument("--output", default="slo_batch_results.jsonl", help="JSON-lines output file for batch mode")
+    args = parser.parse_args()
+
+    if args.batch:
+        main_batch(args.batch, args.output, args.concurrency)
+        return
+
+    # Show classifier/adapter INFO output (print_result etc.) as plain messages; LOG_LEVEL overrides
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper(), format='%(message)s')
+
     print("\n" + "="*80)
     print("CONVERSATIONAL SLO MANAGER - ORCHESTRATOR")
     print("="*80)
     print("\nInitializing orchestrator...")
 
     try:
-        orchestrator = SLOOrchestrator()
+        orchestrator = SLOOrchestrator(verbose=True)
         print("✅ Orchestrator initialized successfully!\n")
     except Exception as e:
         print(f"❌ Failed to initialize orchestrator: {e}")
@@ -428,8 +1074,8 @@ def main():
 
             if user_input.lower() == 'export':
                 if last_result:
-                    filename = f"slo_result_{int(last_result['time_resolution']['start_time'])}.json"
-                    orchestrator.export_to_json(last_result, filename)
+                    filename = orchestrator.export_filename(last_result)
+                    orchestrator.export_to_json(last_result, filename, skip_existing=True)
                 else:
                     print("⚠️  No result to export. Run a query first.")
                 continue
@@ -0,0 +1,60 @@
+"""Tests for the intent classifier's keyword fast path"""
+
+import os
+import sys
+import unittest
+
+# intent_classifier.py imports its sibling modules by bare name (as orchestrator.py sets up)
+_CLASSIFIER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'intent_classifier')
+if _CLASSIFIER_DIR not in sys.path:
+    sys.path.append(_CLASSIFIER_DIR)
+
+try:
+    from intent_classifier.intent_classifier import IntentClassifier
+except ImportError:  # boto3 not installed
+    IntentClassifier = None
+
+
+@unittest.skipIf(IntentClassifier is None, "intent classifier dependencies not installed")
+class KeywordFastPathTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Keyword matcher only - no Bedrock client needed
+        cls.classifier = IntentClassifier.__new__(IntentClassifier)
+        cls.classifier.intent_categories = cls.classifier._load_yaml('intent_categories.yaml')
+        cls.classifier._keyword_to_intent, cls.classifier._keyword_re = cls.classifier._build_keyword_matcher()
+
+    def test_recognized_time_phrases_skip_the_llm(self):
+        cases = {
+            "What is the burn rate today": "today",
+            "burn rate over the past 3 days": "past_3_days",
+            "remaining error budget right now": "current",
+        }
+        for query, time_range in cases.items():
+            with self.subTest(query=query):
+                result = self.classifier._match_keywords(query)
+                self.assertIsNotNone(result)
+                self.assertEqual(result["entities"]["time_range"], time_range)
+
+    def test_unrecognized_time_phrases_fall_through(self):
+        for query in (
+            "burn rate for the last 30 minutes",
+            "burn rate since Monday",
+            "burn rate in March",
+            "burn rate",
+        ):
+            with self.subTest(query=query):
+                self.assertIsNone(self.classifier._match_keywords(query))
+
+    def test_named_target_falls_through(self):
+        for query in (
+            "remaining error budget for payments today",
+            "burn rate of checkout this week",
+            "rollback on orders right now",
+        ):
+            with self.subTest(query=query):
+                self.assertIsNone(self.classifier._match_keywords(query))
+
+
+if __name__ == "__main__":
+    unittest.main()
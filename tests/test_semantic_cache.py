@@ -0,0 +1,84 @@
+"""Tests for the semantic intent cache"""
+
+import tempfile
+import unittest
+from unittest import mock
+
+from utils import semantic_cache
+from utils.semantic_cache import SemanticCache
+
+
+# Query pairs that look alike but must not share cached entities
+NEAR_MISSES = [
+    ("What is the status of payment-api for the past 7 days",
+     "What is the status of payment-ui for the past 7 days"),
+    ("Show errors for checkout over the past 10 days",
+     "Show errors for checkout over the past 1 days"),
+    ("Error budget of orders-api", "Error budget of order-api"),
+    ("What is the status of payment-api today", "What is the status of payment-api yesterday"),
+    ("Error budget burn for checkout this week", "Error budget burn for checkout last month"),
+    ("Latency of checkout over the past day", "Latency of checkout over the past hour"),
+]
+
+
+class _Vector(list):
+    def tolist(self):
+        return list(self)
+
+
+class _IdenticalModel:
+    """Embedding model stub that rates every pair of queries as identical"""
+
+    def __init__(self, name):
+        pass
+
+    def encode(self, text, normalize_embeddings=True):
+        return _Vector([1.0, 0.0])
+
+
+class ExactOnlyWithoutModelTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(semantic_cache, "SentenceTransformer", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = SemanticCache(path=self.tmp.name, threshold=0.92)
+
+    def test_normalized_repeat_hits(self):
+        self.cache.put("Status of payment-api today", {"service": "payment-api"})
+        self.assertEqual(self.cache.get("  status OF payment-api   today"), {"service": "payment-api"})
+
+    def test_near_misses_do_not_hit(self):
+        for stored, query in NEAR_MISSES:
+            with self.subTest(query=query):
+                self.cache.put(stored, {"query": stored})
+                self.assertIsNone(self.cache.get(query))
+
+
+class AnchorTokensWithModelTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(semantic_cache, "SentenceTransformer", _IdenticalModel)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = SemanticCache(path=self.tmp.name, threshold=0.92)
+
+    def test_near_misses_do_not_hit(self):
+        for stored, query in NEAR_MISSES:
+            with self.subTest(query=query):
+                self.cache.clear()
+                self.cache.put(stored, {"query": stored})
+                self.assertIsNone(self.cache.get(query))
+
+    def test_rephrasing_with_same_anchors_hits(self):
+        self.cache.put("What is the status of payment-api for the past 7 days", {"service": "payment-api"})
+        self.assertEqual(
+            self.cache.get("How is payment-api doing over the past 7 days?"),
+            {"service": "payment-api"}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
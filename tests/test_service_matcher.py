@@ -0,0 +1,125 @@
+"""Tests for ServiceMatcher scoring against the bundled services.yaml"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from difflib import SequenceMatcher
+from unittest import mock
+
+from utils.lev_simd import build_pattern_masks, similarity_ratio
+from utils import service_matcher
+from utils.service_matcher import ServiceMatcher
+
+_SERVICES_YAML = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'services.yaml')
+
+# Short queries as the intent classifier extracts them
+QUERIES = ["prompt categories", "alert email", "release history", "error details",
+           "notifications", "reports", "user profile", "dashboard-stats"]
+
+
+def _lcs_ratio(query, path):
+    return similarity_ratio(build_pattern_masks(path), len(path), query)
+
+
+class SimilarityScaleTest(unittest.TestCase):
+    """2 * LCS / (m + n) is an upper bound on SequenceMatcher.ratio(), not the same scale"""
+
+    @classmethod
+    def setUpClass(cls):
+        # Copy the catalog so the matcher's pickle snapshot is not written into the repo
+        cls._tmpdir = tempfile.mkdtemp()
+        services_yaml = os.path.join(cls._tmpdir, 'services.yaml')
+        shutil.copy(_SERVICES_YAML, services_yaml)
+        cls.matcher = ServiceMatcher(services_yaml)
+        cls.paths = [path.lower().strip() for path in cls.matcher._paths]
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls._tmpdir, ignore_errors=True)
+
+    def test_lcs_ratio_never_below_sequence_matcher(self):
+        for query in QUERIES:
+            for path in self.paths:
+                self.assertGreaterEqual(
+                    _lcs_ratio(query, path) + 1e-9, SequenceMatcher(None, query, path).ratio(), (query, path)
+                )
+
+    def test_scattered_characters_score_above_the_cutoff(self):
+        # Known near miss: no shared run longer than two characters, yet LCS clears 0.3
+        self.assertLess(SequenceMatcher(None, "prompt categories", "others").ratio(), 0.3)
+        self.assertAlmostEqual(_lcs_ratio("prompt categories", "others"), 10 / 23)
+
+    def test_near_miss_does_not_outrank_the_real_service(self):
+        match = self.matcher.find_best_match("prompt categories")
+        self.assertEqual(match['service_path'], 'wmuitestcontroller/api/ai/prompt-categories')
+
+    def test_default_cutoff_keeps_weak_true_matches(self):
+        # Scores just above 0.3 - a stricter cutoff to offset the LCS inflation would drop it
+        match = self.matcher.find_best_match("alert email")
+        self.assertEqual(match['service_path'], 'wmebonboarding/api/pipelines/alert-email/is-enabled')
+        self.assertLess(match['similarity_score'], 0.35)
+
+
+class TopMatchTest(unittest.TestCase):
+    """find_best_match on the bundled catalog must agree with a full scan"""
+
+    QUERIES = QUERIES + ["payment service", "auth-service", "alerts", "test runs", "mobile devices"]
+
+    @classmethod
+    def setUpClass(cls):
+        cls._tmpdir = tempfile.mkdtemp()
+        services_yaml = os.path.join(cls._tmpdir, 'services.yaml')
+        shutil.copy(_SERVICES_YAML, services_yaml)
+        cls.matcher = ServiceMatcher(services_yaml)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls._tmpdir, ignore_errors=True)
+
+    def _top_ids(self):
+        self.matcher.clear_cache()
+        return {
+            query: (self.matcher.find_best_match(query) or {}).get('service_id')
+            for query in self.QUERIES
+        }
+
+    def test_top_match_equals_full_scan(self):
+        default = self._top_ids()
+        with mock.patch.object(service_matcher, 'TFIDF_MIN_CATALOG_SIZE', 10 ** 9), \
+                mock.patch.object(service_matcher, 'TFIDF_CANDIDATES', 10 ** 9):
+            full_scan = self._top_ids()
+        self.assertEqual(default, full_scan)
+        self.assertEqual(default['payment service'], 32902)
+        self.assertEqual(default['auth-service'], 32752)
+
+    def test_prefilter_still_runs_on_large_catalogs(self):
+        with mock.patch.object(service_matcher, 'TFIDF_MIN_CATALOG_SIZE', 0), \
+                mock.patch.object(ServiceMatcher, '_tfidf_candidates', autospec=True,
+                                  side_effect=ServiceMatcher._tfidf_candidates) as nearest:
+            self._top_ids()
+        self.assertTrue(nearest.called)
+        self.matcher.clear_cache()
+
+
+class SnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self._tmpdir, True)
+        self.services_yaml = os.path.join(self._tmpdir, 'services.yaml')
+        shutil.copy(_SERVICES_YAML, self.services_yaml)
+
+    def test_unreadable_snapshot_is_rebuilt(self):
+        # Snapshot referencing a module that no longer exists: pickle.load raises ImportError
+        with open(self.services_yaml + '.pkl', 'wb') as f:
+            f.write(b'cremoved_module\nSnapshot\n.')
+
+        with self.assertLogs('utils.service_matcher', level='WARNING'):
+            matcher = ServiceMatcher(self.services_yaml)
+
+        self.assertTrue(matcher.services_by_id)
+        self.assertIsNotNone(ServiceMatcher(self.services_yaml)._read_snapshot())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Tests for the time range resolver (dateparser replaced by a fake where it is reached)"""
+
+import sys
+import types
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from utils import time_range_resolver
+from utils.time_range_resolver import resolve_time_range_from_query
+
+# Recent calendar days (within the 2-year cap), at midnight
+MONDAY = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=10)
+FRIDAY = MONDAY + timedelta(days=4)
+
+
+def _fake_search_dates(query, settings):
+    """Calendar days ignore RELATIVE_BASE; "three days back" follows it"""
+    base = settings["RELATIVE_BASE"]
+    if query == "from monday to friday":
+        return [("monday", MONDAY), ("friday", FRIDAY)]
+    if query == "between monday and three days back":
+        return [("monday", MONDAY), ("three days back", base - timedelta(days=3))]
+    return None
+
+
+class RelativeDatesTest(unittest.TestCase):
+    def test_single_relative_expression_ends_now(self):
+        self.assertEqual(resolve_time_range_from_query("past 3 days")["duration_days"], 3.0)
+        self.assertEqual(resolve_time_range_from_query("2 hours ago")["duration_days"], 2 / 24)
+
+    def test_two_relative_expressions_form_a_range(self):
+        result = resolve_time_range_from_query("from 3 days ago to 1 day ago", string_timestamps=False)
+        self.assertEqual(result["duration_days"], 2.0)
+        self.assertEqual(result["end_time"] - result["start_time"], 2 * 86400 * 1000)
+
+    def test_range_order_does_not_matter(self):
+        self.assertEqual(
+            resolve_time_range_from_query("between 3 days ago and 2 weeks ago")["duration_days"], 11.0
+        )
+
+
+class DateparserCacheTest(unittest.TestCase):
+    def setUp(self):
+        dateparser = types.ModuleType("dateparser")
+        dateparser.parse = lambda query, settings: None
+        search = types.ModuleType("dateparser.search")
+        search.search_dates = _fake_search_dates
+        patcher = mock.patch.dict(sys.modules, {"dateparser": dateparser, "dateparser.search": search})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        time_range_resolver._parse_with_dateparser.cache_clear()
+        self.addCleanup(time_range_resolver._parse_with_dateparser.cache_clear)
+
+    def test_calendar_dates_stay_at_midnight(self):
+        result = resolve_time_range_from_query("from Monday to Friday", string_timestamps=False)
+        self.assertEqual(result["start_time"], int(MONDAY.timestamp() * 1000))
+        self.assertEqual(result["duration_days"], 4.0)
+
+    def test_relative_dates_follow_now(self):
+        before = datetime.now(timezone.utc)
+        result = resolve_time_range_from_query("Between Monday and three days back", string_timestamps=False)
+        # MONDAY is earliest; the relative date is re-anchored to the exact current time
+        self.assertEqual(result["start_time"], int(MONDAY.timestamp() * 1000))
+        self.assertGreaterEqual(result["end_time"], int((before - timedelta(days=3)).timestamp() * 1000))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Adapter Response Cache
+Disk-backed TTL cache for adapter (Java Stats / ClickHouse) responses
+
+Keys are canonicalized argument dicts hashed with SHA-256; time bounds are floored
+to the query's index granularity so requests differing only by seconds share an entry.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+# Milliseconds per index granularity used for time bucketing
+BUCKET_MS = {
+    "HOURLY": 60 * 60 * 1000,
+    "DAILY": 24 * 60 * 60 * 1000,
+}
+
+
+def bucket_ms(timestamp_ms: Any, index: Optional[str]) -> int:
+    """
+    Floor a millisecond timestamp to the index granularity (hourly by default)
+
+    Args:
+        timestamp_ms: Unix timestamp in milliseconds (int or numeric string)
+        index: Index granularity (HOURLY, DAILY) or None
+
+    Returns:
+        Bucketed timestamp in milliseconds
+    """
+    size = BUCKET_MS.get(index, BUCKET_MS["HOURLY"])
+    return int(timestamp_ms) // size * size
+
+
+def make_key(**canonical_args: Any) -> str:
+    """
+    Build a stable cache key from keyword arguments
+
+    Sets/frozensets are sorted so argument order never changes the key.
+
+    Returns:
+        SHA-256 hex digest
+    """
+    normalized = {
+        name: sorted(value) if isinstance(value, (set, frozenset)) else value
+        for name, value in canonical_args.items()
+    }
+    payload = json.dumps(normalized, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class AdapterCache:
+    """
+    SQLite-backed key/value cache with per-entry expiry
+    """
+
+    def __init__(self, path: str = ".slo_cache/adapters", ttl_seconds: int = 300):
+        """
+        Initialize the cache
+
+        Args:
+            path: Directory holding the SQLite store
+            ttl_seconds: Default lifetime of stored entries
+        """
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        os.makedirs(path, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(path, "adapters.sqlite"), check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value BLOB, expires REAL)"
+            )
+            self._db.execute("DELETE FROM responses WHERE expires < ?", (time.time(),))
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up an unexpired entry
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            Cached value or None
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM responses WHERE key = ? AND expires >= ?", (key, time.time())
+            ).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any, expire: Optional[int] = None):
+        """
+        Store an entry
+
+        Args:
+            key: Key from make_key()
+            value: Picklable value
+            expire: Lifetime in seconds (defaults to ttl_seconds)
+        """
+        expires = time.time() + (expire if expire is not None else self.ttl_seconds)
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)", (key, blob, expires))
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses")
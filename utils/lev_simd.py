@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Bit-Parallel String Similarity
+Word-parallel (SWAR) LCS kernel used by ServiceMatcher for similarity scoring
+
+Each pattern character is encoded as a bitmask of its positions, so one pass over
+the text computes the LCS length with a handful of integer operations per character
+(Hyyrö / Allison-Dix bit-parallel LCS). Python ints are arbitrary width, so paths
+longer than 64 characters need no block splitting.
+"""
+
+from typing import Dict
+
+
+def build_pattern_masks(pattern: str) -> Dict[str, int]:
+    """
+    Build the per-character position bitmasks for a pattern
+
+    Args:
+        pattern: Pattern string (already normalized)
+
+    Returns:
+        Mapping of character -> bitmask with bit i set where pattern[i] == character
+    """
+    masks: Dict[str, int] = {}
+    bit = 1
+    for ch in pattern:
+        masks[ch] = masks.get(ch, 0) | bit
+        bit <<= 1
+    return masks
+
+
+def lcs_length(pattern_masks: Dict[str, int], m: int, text: str) -> int:
+    """
+    Compute the length of the longest common subsequence of pattern and text
+
+    Args:
+        pattern_masks: Bitmasks from build_pattern_masks()
+        m: Pattern length
+        text: Text string (already normalized)
+
+    Returns:
+        LCS length
+    """
+    if m == 0 or not text:
+        return 0
+
+    all_ones = (1 << m) - 1
+    s = all_ones
+    for ch in text:
+        u = s & pattern_masks.get(ch, 0)
+        s = ((s + u) | (s - u)) & all_ones
+
+    return m - s.bit_count()
+
+
+def similarity_ratio(pattern_masks: Dict[str, int], m: int, text: str) -> float:
+    """
+    Normalized similarity 2 * LCS / (len(pattern) + len(text))
+
+    Always >= difflib.SequenceMatcher.ratio() for the same pair: the LCS may pick up
+    scattered single characters that Ratcliff-Obershelp never counts, so short unrelated
+    paths score higher ("prompt categories" vs "others": 0.43 here, 0.17 there).
+
+    Args:
+        pattern_masks: Bitmasks from build_pattern_masks()
+        m: Pattern length
+        text: Text string (already normalized)
+
+    Returns:
+        Similarity score (0.0 to 1.0)
+    """
+    total = m + len(text)
+    if total == 0:
+        return 1.0
+    return 2.0 * lcs_length(pattern_masks, m, text) / total
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Semantic Intent Cache
+Persists LLM intent classifications on disk and serves them for repeated or
+near-identical queries (cosine similarity of query embeddings above a threshold)
+
+Exact repeats (after case/whitespace normalization) are answered from a dict
+before any embedding is computed; only misses pay for the similarity scan.
+
+Embeddings come from sentence-transformers (all-MiniLM-L6-v2) when it is installed;
+otherwise only exact (normalized) repeats are served. Similarity hits additionally
+require the same numbers, service-like tokens and time words as the stored query,
+since the cached entities (service, time range) are reused as-is.
+"""
+
+import os
+import pickle
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+
+# Sentence-transformers model used when available
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# Tokens that must match exactly for a similarity hit: numbers ("past 10 days"),
+# service-like names ("payment-api", "orders_svc", "v1/health") and time words
+# ("today" vs "yesterday", "this week" vs "last month"; plurals count as the unit)
+_DIGITS_PATTERN = re.compile(r'\d+')
+_TOKEN_PATTERN = re.compile(r'[\w\-./]+')
+_SERVICE_TOKEN_PATTERN = re.compile(r'\w[-_./]\w')
+_TIME_WORD_PATTERN = re.compile(
+    r'\b(today|yesterday|tomorrow|this|last|past|previous|current|now'
+    r'|second|minute|hour|day|week|month|year)s?\b'
+)
+
+
+def _exact_key(text: str) -> str:
+    """Normalized query used for exact-match lookups"""
+    return ' '.join(text.lower().split())
+
+
+def _anchor_tokens(text: str) -> Tuple[Tuple[str, ...], FrozenSet[str], FrozenSet[str]]:
+    """
+    Numbers, service-like tokens and time words of a query, which a similar query must share
+
+    Args:
+        text: Query text
+
+    Returns:
+        (digit runs in order, set of service-like tokens, set of time words)
+    """
+    lowered = text.lower()
+    services = frozenset(
+        token.strip('-./') for token in _TOKEN_PATTERN.findall(lowered)
+        if _SERVICE_TOKEN_PATTERN.search(token)
+    )
+    time_words = frozenset(_TIME_WORD_PATTERN.findall(lowered))
+    return tuple(_DIGITS_PATTERN.findall(lowered)), services, time_words
+
+
+class SemanticCache:
+    """
+    Disk-backed cache of intent classifications keyed by query-embedding similarity
+
+    Only the LLM portion of a classification (intent/entities) should be stored;
+    anything time-sensitive (e.g. timestamp resolution) must be recomputed by the caller.
+    """
+
+    def __init__(self, path: str = ".slo_cache/intents", threshold: float = 0.92, ttl_seconds: int = 3600):
+        """
+        Initialize the cache and load unexpired entries into memory
+
+        Args:
+            path: Directory holding the SQLite store
+            threshold: Minimum cosine similarity for a hit (0.0 to 1.0)
+            ttl_seconds: Entries older than this are ignored and purged
+        """
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        self._model = SentenceTransformer(EMBEDDING_MODEL) if SentenceTransformer else None
+        backend = EMBEDDING_MODEL if self._model else "exact"
+
+        os.makedirs(path, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(path, f"{backend}.sqlite"), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS intents ("
+            "query TEXT PRIMARY KEY, embedding BLOB, result BLOB, created REAL)"
+        )
+
+        # In-memory index: (query, embedding, pickled result, created, anchor tokens);
+        # results stay serialized so a hit is one pickle.loads instead of a dumps/loads
+        # round trip. Only used with an embedding model.
+        self._entries: List[Tuple[str, Any, bytes, float, Tuple]] = []
+        # Exact tier: normalized query -> (pickled result, created)
+        self._exact: Dict[str, Tuple[bytes, float]] = {}
+        self._load()
+
+    def _load(self):
+        """Purge expired rows and load the rest into memory"""
+        cutoff = time.time() - self.ttl_seconds
+        with self._db:
+            self._db.execute("DELETE FROM intents WHERE created < ?", (cutoff,))
+        for query, embedding, result, created in self._db.execute(
+            "SELECT query, embedding, result, created FROM intents"
+        ):
+            if self._model is not None:
+                self._entries.append((query, pickle.loads(embedding), result, created, _anchor_tokens(query)))
+            self._exact[_exact_key(query)] = (result, created)
+
+    def _embed(self, text: str) -> Optional[List[float]]:
+        """Embed a query (unit-length vector), or None without an embedding model"""
+        if self._model is None:
+            return None
+        return self._model.encode(text, normalize_embeddings=True).tolist()
+
+    @staticmethod
+    def _similarity(a: List[float], b: List[float]) -> float:
+        """Cosine similarity of two embeddings from _embed()"""
+        return sum(x * y for x, y in zip(a, b))
+
+    def get(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the cached classification of the most similar stored query
+
+        Args:
+            query: User query
+
+        Returns:
+            Cached classification (caller-owned copy) or None on miss
+        """
+        cutoff = time.time() - self.ttl_seconds
+
+        with self._lock:
+            exact = self._exact.get(_exact_key(query))
+        if exact is not None and exact[1] >= cutoff:
+            return pickle.loads(exact[0])
+
+        # Without a real embedding model there is no trustworthy similarity: exact hits only
+        if self._model is None:
+            return None
+
+        embedding = self._embed(query)
+        anchors = _anchor_tokens(query)
+        best_score = self.threshold
+        best_result = None
+        with self._lock:
+            for _, stored_embedding, result, created, stored_anchors in self._entries:
+                # Cached entities are reused as-is, so numbers and service names must agree
+                if created < cutoff or stored_anchors != anchors:
+                    continue
+                score = self._similarity(embedding, stored_embedding)
+                if score >= best_score:
+                    best_score = score
+                    best_result = result
+
+        # Decode a fresh copy so callers can't mutate the cached entry
+        return pickle.loads(best_result) if best_result is not None else None
+
+    def put(self, query: str, result: Dict[str, Any]):
+        """
+        Store a classification for a query
+
+        Args:
+            query: User query
+            result: Classification to cache (intent/entities only)
+        """
+        embedding = self._embed(query)
+        blob = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        created = time.time()
+        with self._lock:
+            if self._model is not None:
+                self._entries = [entry for entry in self._entries if entry[0] != query]
+                self._entries.append((query, embedding, blob, created, _anchor_tokens(query)))
+            self._exact[_exact_key(query)] = (blob, created)
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO intents VALUES (?, ?, ?, ?)",
+                    (query, pickle.dumps(embedding), blob, created)
+                )
+
+    def clear(self):
+        """Drop all cached entries"""
+        with self._lock:
+            self._entries = []
+            self._exact = {}
+            with self._db:
+                self._db.execute("DELETE FROM intents")
+
+
+# Process-wide cache shared by every orchestrator in this process (loads the embedding model once)
+_CACHE: Optional[SemanticCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_semantic_cache(path: str = ".slo_cache/intents", threshold: float = 0.92) -> SemanticCache:
+    """
+    Get the process-wide SemanticCache, creating it (and loading the model) on first use only
+
+    Args:
+        path: Directory holding the SQLite store (used on first call only)
+        threshold: Minimum cosine similarity for a hit (used on first call only)
+
+    Returns:
+        Shared SemanticCache instance
+    """
+    global _CACHE
+
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = SemanticCache(path=path, threshold=threshold)
+
+    return _CACHE
@@ -7,8 +7,94 @@ Uses similarity scoring to find the best matches
 
 import yaml
 from typing import List, Dict, Any, Optional, Tuple
-from difflib import SequenceMatcher
+import functools
+import heapq
+import logging
+import math
 import os
+import pickle
+import re
+import threading
+from collections import Counter, defaultdict
+
+try:
+    from .lev_simd import build_pattern_masks, similarity_ratio
+except ImportError:
+    # Running as a standalone script (python utils/service_matcher.py)
+    from lev_simd import build_pattern_masks, similarity_ratio
+
+# libyaml C bindings when available (much faster than the pure-Python loader)
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Bump when the layout of the services.yaml.pkl snapshot changes
+SNAPSHOT_VERSION = 1
+
+# RapidFuzz scores the whole candidate list in C when installed. Its integer Indel
+# distance d gives 2 * LCS = (n + m) - d, so scores are bit-identical to the kernel's
+try:
+    from rapidfuzz import process as rapidfuzz_process
+    from rapidfuzz.distance import Indel
+except ImportError:
+    rapidfuzz_process = Indel = None
+
+logger = logging.getLogger(__name__)
+
+
+def _indel_ratio(distance: int, total: int) -> float:
+    """Similarity 2 * LCS / total from an Indel distance (same arithmetic as similarity_ratio)"""
+    return (total - distance) / total if total else 1.0
+
+
+# Separators between tokens in service names / paths ("mobile-devices/dashboard-stats")
+TOKEN_SPLIT_PATTERN = re.compile(r'[-_/\s]+')
+
+# Token-set scoring is used for queries with at most this many tokens...
+MAX_TOKEN_SET_SIZE = 6
+
+# ...and only when the best token-set score reaches this value
+MIN_TOKEN_SET_SCORE = 0.5
+
+# Character n-gram sizes of the TF-IDF candidate index (like analyzer='char_wb')
+TFIDF_NGRAM_RANGE = (3, 5)
+
+# Services kept by the TF-IDF prefilter before exact similarity scoring
+TFIDF_CANDIDATES = 50
+
+# The prefilter can drop the best similarity match (it ranks by shared n-grams, not LCS),
+# so catalogs up to this size are always scanned in full
+TFIDF_MIN_CATALOG_SIZE = 2000
+
+# Maximum number of distinct (service name, options) match results kept per matcher
+FIND_MATCHES_CACHE_SIZE = 2048
+
+# Substring index granularity; shorter queries use a linear scan
+SUBSTRING_GRAM_SIZE = 3
+
+# Words inside service paths/names for n-gram extraction
+_WORD_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def _char_ngrams(text: str) -> Counter:
+    """
+    Count word-bounded character n-grams of a string (TFIDF_NGRAM_RANGE sizes)
+
+    Args:
+        text: Service path, name or query
+
+    Returns:
+        Counter of n-gram -> occurrences
+    """
+    low, high = TFIDF_NGRAM_RANGE
+    grams = Counter()
+    for word in _WORD_PATTERN.findall(text.lower()):
+        padded = f" {word} "
+        for n in range(low, high + 1):
+            for i in range(len(padded) - n + 1):
+                grams[padded[i:i + n]] += 1
+    return grams
 
 
 class ServiceMatcher:
@@ -16,6 +102,13 @@ class ServiceMatcher:
     Matches service names to service IDs using similarity scoring
     """
 
+    __slots__ = (
+        'services_yaml_path', 'services_data', 'services_by_id',
+        '_path_masks', '_service_ids', '_paths', '_names', '_paths_lower', '_names_lower',
+        '_paths_normalized', '_path_lengths', '_position', '_cached_find_matches',
+        '_path_tokens', '_idf', '_postings', '_trigram_index',
+    )
+
     def __init__(self, services_yaml_path: str = "services.yaml"):
         """
         Initialize the service matcher
@@ -25,9 +118,240 @@ class ServiceMatcher:
         """
         # Try to find services.yaml in multiple locations
         self.services_yaml_path = self._find_services_file(services_yaml_path)
-        self.services_data = self._load_services()
+
+        # Parsed YAML and load-time indexes, from the pickle snapshot while the YAML is unchanged
+        snapshot = self._read_snapshot()
+        self.services_data = snapshot['services_data'] if snapshot else self._load_services()
         self.services_by_id = self.services_data.get('services_by_id', {})
 
+        # Precompute bit-parallel pattern masks for every service_path (pure-Python kernel only)
+        self._path_masks = {
+            service_id: self._build_masks(service_info.get('service_path', ''))
+            for service_id, service_info in self.services_by_id.items()
+        } if rapidfuzz_process is None else {}
+
+        # Catalog as parallel lists (catalog order keeps ties stable); lowercased once here
+        # so find_matches only compares strings
+        self._service_ids = list(self.services_by_id)
+        self._paths = [info.get('service_path', '') for info in self.services_by_id.values()]
+        self._names = [info.get('service_name', '') for info in self.services_by_id.values()]
+        self._paths_lower = [path.lower() for path in self._paths]
+        self._names_lower = [name.lower() for name in self._names]
+        self._paths_normalized = [path.strip() for path in self._paths_lower]
+        self._path_lengths = [len(path) for path in self._paths_normalized]
+        self._position = {service_id: i for i, service_id in enumerate(self._service_ids)}
+
+        # Per-instance memo of match results (the catalog is fixed for the matcher's lifetime)
+        self._cached_find_matches = functools.lru_cache(maxsize=FIND_MATCHES_CACHE_SIZE)(
+            self._find_matches_uncached
+        )
+
+        if snapshot:
+            self._path_tokens, self._idf, self._postings, self._trigram_index = snapshot['indexes']
+        else:
+            # Precompute token sets for the token-set fast path
+            self._path_tokens = {
+                service_id: self._tokenize(service_info.get('service_path', ''))
+                for service_id, service_info in self.services_by_id.items()
+            }
+
+            # Sparse TF-IDF index (n-gram -> postings) used to prefilter candidates
+            self._idf, self._postings = self._build_tfidf_index()
+
+            # Character trigram -> catalog positions whose lowercased path or name contains it
+            self._trigram_index = self._build_trigram_index()
+
+            self._write_snapshot()
+
+    def _read_snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the pickle snapshot if it is at least as new as services.yaml
+
+        Returns:
+            Snapshot dict, or None when missing, stale or unreadable
+        """
+        cache_path = self.services_yaml_path + '.pkl'
+        try:
+            if os.path.getmtime(cache_path) < os.path.getmtime(self.services_yaml_path):
+                return None
+        except OSError:
+            return None  # No snapshot yet - parse the YAML
+
+        try:
+            with open(cache_path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except Exception as e:
+            # Corrupt, truncated or written by an incompatible version - rebuild it
+            logger.warning("Ignoring unreadable services snapshot %s: %s", cache_path, e)
+            return None
+
+        if not isinstance(snapshot, dict) or snapshot.get('version') != SNAPSHOT_VERSION:
+            return None
+        return snapshot
+
+    def _write_snapshot(self):
+        """Persist the parsed YAML and load-time indexes next to services.yaml"""
+        snapshot = {
+            'version': SNAPSHOT_VERSION,
+            'services_data': self.services_data,
+            'indexes': (self._path_tokens, self._idf, self._postings, self._trigram_index),
+        }
+        try:
+            with open(self.services_yaml_path + '.pkl', 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            pass  # Read-only install - just skip caching
+
+    def _build_trigram_index(self) -> Dict[str, set]:
+        """
+        Build an inverted index of character trigrams over lowercased paths and names
+
+        Returns:
+            Mapping of trigram -> set of catalog positions
+        """
+        n = SUBSTRING_GRAM_SIZE
+        index = defaultdict(set)
+        for i, (path, name) in enumerate(zip(self._paths_lower, self._names_lower)):
+            for text in (path, name):
+                for j in range(len(text) - n + 1):
+                    index[text[j:j + n]].add(i)
+        return dict(index)
+
+    def _substring_hits(self, query: str) -> Tuple[set, set]:
+        """
+        Catalog positions whose lowercased path / name contains the query
+
+        Intersects the trigram postings of the query (smallest first) and verifies
+        the survivors; queries shorter than a trigram fall back to a linear scan.
+
+        Args:
+            query: Lowercased query
+
+        Returns:
+            Tuple of (positions matching in path, positions matching in name)
+        """
+        n = SUBSTRING_GRAM_SIZE
+        if len(query) < n:
+            candidates = range(len(self._service_ids))
+        else:
+            postings = []
+            for gram in {query[j:j + n] for j in range(len(query) - n + 1)}:
+                posting = self._trigram_index.get(gram)
+                if not posting:
+                    return set(), set()
+                postings.append(posting)
+            postings.sort(key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+
+        path_hits = {i for i in candidates if query in self._paths_lower[i]}
+        name_hits = {i for i in candidates if query in self._names_lower[i]}
+        return path_hits, name_hits
+
+    def _build_tfidf_index(self) -> Tuple[Dict[str, float], Dict[str, List[Tuple[int, float]]]]:
+        """
+        Build an inverted TF-IDF index over service paths and names
+
+        Each service vector is L2-normalized, so a query's cosine similarity with
+        every service is one sparse matrix-vector product over the query's postings.
+
+        Returns:
+            Tuple of (n-gram -> idf, n-gram -> [(service_id, weight), ...])
+        """
+        grams_by_id = {
+            service_id: _char_ngrams(f"{info.get('service_path', '')} {info.get('service_name', '')}")
+            for service_id, info in self.services_by_id.items()
+        }
+
+        doc_freq = Counter(gram for grams in grams_by_id.values() for gram in grams)
+        n_docs = len(grams_by_id)
+        idf = {gram: math.log((1 + n_docs) / (1 + df)) + 1.0 for gram, df in doc_freq.items()}
+
+        postings = defaultdict(list)
+        for service_id, grams in grams_by_id.items():
+            weights = {gram: count * idf[gram] for gram, count in grams.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for gram, weight in weights.items():
+                postings[gram].append((service_id, weight / norm))
+
+        return idf, dict(postings)
+
+    def _tfidf_candidates(self, query: str, limit: int) -> List[int]:
+        """
+        Top services by TF-IDF cosine similarity to the query
+
+        Args:
+            query: Normalized service name
+            limit: Maximum number of candidates
+
+        Returns:
+            Service IDs with non-zero similarity, best first (empty if the query has no known n-grams)
+        """
+        weights = {gram: count * self._idf[gram] for gram, count in _char_ngrams(query).items() if gram in self._idf}
+        if not weights:
+            return []
+
+        scores = defaultdict(float)
+        for gram, weight in weights.items():
+            for service_id, service_weight in self._postings[gram]:
+                scores[service_id] += weight * service_weight
+
+        return heapq.nlargest(limit, scores, key=scores.__getitem__)
+
+    @staticmethod
+    def _tokenize(text: str) -> frozenset:
+        """
+        Split a service name or path into its lowercase tokens
+
+        Args:
+            text: Service name or path (e.g., "mobile-devices/dashboard-stats")
+
+        Returns:
+            Frozen set of non-empty tokens
+        """
+        return frozenset(tok for tok in TOKEN_SPLIT_PATTERN.split(text.lower().strip()) if tok)
+
+    def _token_set_scores(self, query: str) -> Optional[Dict[int, float]]:
+        """
+        Score every service by token-set Jaccard similarity
+
+        Only used for short hyphenated queries; returns None when the query has too
+        many tokens or no service scores at least MIN_TOKEN_SET_SCORE, in which case
+        the caller falls back to the character-level similarity kernel.
+
+        Args:
+            query: Service name from intent classifier
+
+        Returns:
+            Mapping of service_id -> Jaccard score, or None to fall back
+        """
+        query_tokens = self._tokenize(query)
+        if not query_tokens or len(query_tokens) > MAX_TOKEN_SET_SIZE:
+            return None
+
+        scores = {}
+        for service_id, path_tokens in self._path_tokens.items():
+            union = len(query_tokens | path_tokens)
+            scores[service_id] = len(query_tokens & path_tokens) / union if union else 0.0
+
+        if max(scores.values(), default=0.0) < MIN_TOKEN_SET_SCORE:
+            return None
+
+        return scores
+
+    @staticmethod
+    def _build_masks(text: str) -> Tuple[Dict[str, int], int]:
+        """
+        Build the similarity kernel's pattern masks for a string
+
+        Args:
+            text: String to encode
+
+        Returns:
+            Tuple of (character bitmasks, normalized length)
+        """
+        normalized = text.lower().strip()
+        return build_pattern_masks(normalized), len(normalized)
+
     def _find_services_file(self, filename: str) -> str:
         """
         Find services.yaml file in current directory or parent directory
@@ -68,7 +392,7 @@ class ServiceMatcher:
             raise FileNotFoundError(f"Services file not found: {self.services_yaml_path}")
 
         with open(self.services_yaml_path, 'r') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=SafeLoader)
 
     def _calculate_similarity(self, str1: str, str2: str) -> float:
         """
@@ -82,24 +406,28 @@ class ServiceMatcher:
             Similarity score (0.0 to 1.0)
         """
         # Normalize strings (lowercase, strip whitespace)
-        s1 = str1.lower().strip()
-        s2 = str2.lower().strip()
+        return self._sim_norm(str1.lower().strip(), str2.lower().strip())
 
-        # Use SequenceMatcher for similarity
-        return SequenceMatcher(None, s1, s2).ratio()
-
-    def _contains_match(self, query: str, target: str) -> bool:
+    @staticmethod
+    def _sim_norm(s1: str, s2: str) -> float:
         """
-        Check if query string is contained in target string (case-insensitive)
+        Similarity of two already-normalized strings (no lowercasing/stripping)
+
+        find_matches scores against the precomputed normalized paths, so only
+        _calculate_similarity pays for normalization.
 
         Args:
-            query: Query string (e.g., "dashboard-stats")
-            target: Target string (e.g., "wmuitestcontroller/api/mobile-devices/dashboard-stats")
+            s1: Normalized first string
+            s2: Normalized second string
 
         Returns:
-            True if query is found in target
+            Similarity score (0.0 to 1.0)
         """
-        return query.lower() in target.lower()
+        if Indel is not None:
+            return _indel_ratio(Indel.distance(s1, s2), len(s1) + len(s2))
+
+        # Bit-parallel LCS ratio (an upper bound on SequenceMatcher.ratio)
+        return similarity_ratio(build_pattern_masks(s2), len(s2), s1)
 
     def find_matches(
         self,
@@ -124,50 +452,154 @@ class ServiceMatcher:
         if not service_name or not service_name.strip():
             return []
 
-        matches = []
-
-        for service_id, service_info in self.services_by_id.items():
-            service_path = service_info.get('service_path', '')
-            full_service_name = service_info.get('service_name', '')
+        # Matching is case-insensitive, so repeats differing only in case share an entry;
+        # entries are copied so callers can't mutate the cache
+        cached = self._cached_find_matches(service_name.lower(), threshold, use_contains, max_results)
+        return [dict(match) for match in cached]
 
-            # Calculate similarity against service_path
-            similarity_score = self._calculate_similarity(service_name, service_path)
+    def clear_cache(self):
+        """Drop all memoized match results"""
+        self._cached_find_matches.cache_clear()
 
-            # Check for substring match
-            contains_in_path = self._contains_match(service_name, service_path)
-            contains_in_name = self._contains_match(service_name, full_service_name)
+    def _find_matches_uncached(
+        self,
+        service_name: str,
+        threshold: float,
+        use_contains: bool,
+        max_results: int
+    ) -> Tuple[Dict[str, Any], ...]:
+        """
+        Score the catalog against a service name (wrapped by the LRU cache)
 
-            # Determine match type
-            match_type = None
-            final_score = similarity_score
+        Args:
+            service_name: Lowercased, non-blank service name
+            threshold: Minimum similarity score (0.0 to 1.0)
+            use_contains: Also match if service_name is substring of service_path
+            max_results: Maximum number of results to return
 
-            if contains_in_path and use_contains:
+        Returns:
+            Tuple of matches sorted by similarity score (highest first)
+        """
+        matches = []
+        query = service_name.strip()
+
+        # Short hyphenated names: cheap token-set scoring when it finds a good match
+        token_scores = self._token_set_scores(query)
+        similarity_type = "token_set" if token_scores is not None else "similarity"
+
+        # Substring matches of the unstripped query (as before), resolved once for the
+        # whole catalog so the scoring loop only does set lookups
+        path_hits, name_hits = self._substring_hits(service_name) if use_contains else (set(), set())
+
+        # Large catalogs: score only the TF-IDF nearest services plus every substring match
+        # (full scan if the query has no known n-grams); catalog order keeps ties stable
+        positions = range(len(self._service_ids))
+        if len(self._service_ids) > max(TFIDF_MIN_CATALOG_SIZE, TFIDF_CANDIDATES):
+            nearest = self._tfidf_candidates(query, TFIDF_CANDIDATES)
+            if nearest:
+                candidates = {self._position[service_id] for service_id in nearest}
+                if use_contains:
+                    candidates.update(*(self._substring_hits(query) if query != service_name
+                                        else (path_hits, name_hits)))
+                positions = sorted(candidates)
+
+        # Length filter: 2 * LCS / (n + m) <= 2 * min(n, m) / (n + m), so paths whose length
+        # alone keeps them below the threshold are dropped unless they are substring hits
+        # (computed with the same division as the score, so boundary cases round identically)
+        if token_scores is None and threshold > 0:
+            query_len = len(query)
+            path_lengths = self._path_lengths
+            positions = [
+                i for i in positions
+                if i in path_hits or i in name_hits
+                or _indel_ratio(abs(query_len - path_lengths[i]), query_len + path_lengths[i]) >= threshold
+            ]
+
+        # RapidFuzz: score every candidate path in one C call
+        batch_scores = None
+        if token_scores is None and rapidfuzz_process is not None:
+            choices = [self._paths_normalized[i] for i in positions]
+            batch_scores = {
+                positions[k]: _indel_ratio(distance, len(query) + len(choice))
+                for choice, distance, k in rapidfuzz_process.extract(
+                    query, choices, scorer=Indel.distance, processor=None, limit=None
+                )
+            }
+
+        # Hoist catalog lists into locals for the loop
+        service_ids, paths, names, path_masks_by_id = self._service_ids, self._paths, self._names, self._path_masks
+        single = max_results == 1
+        best = None
+
+        for i in positions:
+            service_id = service_ids[i]
+            service_path = paths[i]
+            full_service_name = names[i]
+
+            # Calculate similarity against service_path (masks precomputed at load time)
+            if token_scores is not None:
+                similarity_score = token_scores[service_id]
+            elif batch_scores is not None:
+                similarity_score = batch_scores[i]
+            else:
+                path_masks, path_len = path_masks_by_id[service_id]
+                similarity_score = similarity_ratio(path_masks, path_len, query)
+
+            # Determine match type (substring hits were found up front)
+            if i in path_hits:
                 match_type = "substring_in_path"
                 # Boost score for substring matches
                 final_score = max(similarity_score, 0.7)
 
-            elif contains_in_name and use_contains:
+            elif i in name_hits:
                 match_type = "substring_in_name"
                 final_score = max(similarity_score, 0.6)
 
             elif similarity_score >= threshold:
-                match_type = "similarity"
+                match_type = similarity_type
+                final_score = similarity_score
+
+            else:
+                continue
+
+            if final_score < threshold:
+                continue
+
+            # Single result: keep a running best (first wins ties, like the stable sort
+            # below) and stop at a perfect score since nothing can beat it
+            if single:
+                if best is None or final_score > best[0]:
+                    best = (final_score, i, match_type)
+                    if final_score >= 1.0:
+                        break
+                continue
 
             # Add to matches if it passes threshold
-            if match_type and final_score >= threshold:
-                matches.append({
-                    'service_id': service_id,
-                    'service_name': full_service_name,
-                    'service_path': service_path,
-                    'similarity_score': final_score,
-                    'match_type': match_type
-                })
+            matches.append({
+                'service_id': service_id,
+                'service_name': full_service_name,
+                'service_path': service_path,
+                'similarity_score': final_score,
+                'match_type': match_type
+            })
+
+        if single:
+            if best is None:
+                return ()
+            final_score, i, match_type = best
+            return ({
+                'service_id': service_ids[i],
+                'service_name': names[i],
+                'service_path': paths[i],
+                'similarity_score': final_score,
+                'match_type': match_type
+            },)
 
         # Sort by similarity score (highest first)
         matches.sort(key=lambda x: x['similarity_score'], reverse=True)
 
         # Limit results
-        return matches[:max_results]
+        return tuple(matches[:max_results])
 
     def find_best_match(self, service_name: str, threshold: float = 0.3) -> Optional[Dict[str, Any]]:
         """
@@ -180,6 +612,7 @@ class ServiceMatcher:
         Returns:
             Best matching service or None if no match found
         """
+        # max_results=1 takes the running-best path: no match list, no sort
         matches = self.find_matches(service_name, threshold=threshold, max_results=1)
         return matches[0] if matches else None
 
@@ -205,6 +638,34 @@ class ServiceMatcher:
         return self.services_by_id
 
 
+# Process-wide matcher shared by every orchestrator/example in this process
+_MATCHER: Optional[ServiceMatcher] = None
+_MATCHER_LOCK = threading.Lock()
+
+
+def get_service_matcher(services_yaml_path: str = "services.yaml") -> ServiceMatcher:
+    """
+    Get the process-wide ServiceMatcher, loading services.yaml on first use only
+
+    Args:
+        services_yaml_path: Path to services.yaml file (used on first call only)
+
+    Returns:
+        Shared ServiceMatcher instance
+
+    Raises:
+        FileNotFoundError: If services.yaml cannot be found on first call
+    """
+    global _MATCHER
+
+    if _MATCHER is None:
+        with _MATCHER_LOCK:
+            if _MATCHER is None:
+                _MATCHER = ServiceMatcher(services_yaml_path)
+
+    return _MATCHER
+
+
 def main():
     """Test the service matcher"""
     import argparse